@@ -11,14 +11,17 @@ Real implementation for web apps with:
 """
 
 import asyncio
+import os
 import uuid
 import time
+from collections import defaultdict
 from dataclasses import dataclass, field
 from typing import Any, Optional
+from sortedcontainers import SortedKeyList
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
-from agents import Agent, Runner, function_tool, RunContextWrapper
+from agents import Agent, ModelSettings, Runner, function_tool, RunContextWrapper
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -48,9 +51,42 @@ class PendingConfirmation(BaseModel):
     user_id: str
 
 
-# In production, use Redis or database
+# Redis-backed store: Redis expires tokens with its own expiration wheel, so
+# there is no Python-side expiry sweep, and state is shared across uvicorn
+# workers. Set REDIS_URL to enable; without it we fall back to the in-process
+# dict (fine for single-worker local runs).
+try:
+    import redis as redis_lib
+except ImportError:
+    redis_lib = None
+
+REDIS_URL = os.getenv("REDIS_URL")
+_redis = (
+    redis_lib.Redis.from_url(REDIS_URL, decode_responses=True)
+    if redis_lib and REDIS_URL
+    else None
+)
+
+# Fallback store for local runs without Redis. Pending confirmations are
+# indexed two ways: by expiry (sorted, so the expiry sweep is a bisect +
+# slice instead of a full scan) and by user (so /pending never walks other
+# users' tokens).
 PENDING_CONFIRMATIONS: dict[str, PendingConfirmation] = {}
 CONFIRMED_TOKENS: set[str] = set()
+_BY_EXPIRY = SortedKeyList(key=lambda c: c.expires_at)
+_BY_USER: defaultdict[str, set[str]] = defaultdict(set)
+
+
+def _sweep_expired() -> None:
+    """Drop everything past its expiry in O(log N + k)."""
+    i = _BY_EXPIRY.bisect_key_left(time.time())
+    if not i:
+        return
+    for c in _BY_EXPIRY[:i]:
+        _BY_USER[c.user_id].discard(c.token)
+        PENDING_CONFIRMATIONS.pop(c.token, None)
+        CONFIRMED_TOKENS.discard(c.token)
+    del _BY_EXPIRY[:i]
 
 
 def create_confirmation(
@@ -63,7 +99,7 @@ def create_confirmation(
     """Create a pending confirmation."""
     token = str(uuid.uuid4())
     now = time.time()
-    
+
     confirmation = PendingConfirmation(
         token=token,
         action=f"{tool_name}_{token[:8]}",
@@ -74,27 +110,52 @@ def create_confirmation(
         expires_at=now + ttl_seconds,
         user_id=user_id,
     )
-    
-    PENDING_CONFIRMATIONS[token] = confirmation
+
+    if _redis is not None:
+        # One round-trip: blob with native TTL + per-user index
+        pipe = _redis.pipeline()
+        pipe.set(f"conf:{token}", confirmation.model_dump_json(), ex=ttl_seconds)
+        pipe.sadd(f"conf:user:{user_id}", token)
+        pipe.execute()
+    else:
+        PENDING_CONFIRMATIONS[token] = confirmation
+        _BY_EXPIRY.add(confirmation)
+        _BY_USER[user_id].add(token)
     return confirmation
 
 
 def confirm_token(token: str, user_id: str) -> bool:
     """Confirm a pending action."""
+    if _redis is not None:
+        raw = _redis.get(f"conf:{token}")
+        if raw is None:
+            return False  # unknown or already expired by Redis
+
+        confirmation = PendingConfirmation.model_validate_json(raw)
+        if confirmation.user_id != user_id:
+            return False
+
+        # Confirmed marker inherits the remaining TTL
+        ttl = _redis.ttl(f"conf:{token}")
+        _redis.set(f"conf:ok:{token}", 1, ex=max(ttl, 1))
+        return True
+
     if token not in PENDING_CONFIRMATIONS:
         return False
-    
+
     confirmation = PENDING_CONFIRMATIONS[token]
-    
+
     # Check ownership
     if confirmation.user_id != user_id:
         return False
-    
+
     # Check expiry
     if time.time() > confirmation.expires_at:
         del PENDING_CONFIRMATIONS[token]
+        _BY_EXPIRY.remove(confirmation)
+        _BY_USER[confirmation.user_id].discard(token)
         return False
-    
+
     # Mark as confirmed
     CONFIRMED_TOKENS.add(token)
     return True
@@ -102,15 +163,30 @@ def confirm_token(token: str, user_id: str) -> bool:
 
 def is_confirmed(token: str) -> bool:
     """Check if a token is confirmed."""
+    if _redis is not None:
+        return _redis.exists(f"conf:ok:{token}") == 1
     return token in CONFIRMED_TOKENS
 
 
 def consume_confirmation(token: str) -> Optional[PendingConfirmation]:
     """Consume a confirmed token (one-time use)."""
+    if _redis is not None:
+        # GETDEL makes the consume atomic - no double-spend across workers
+        if not _redis.getdel(f"conf:ok:{token}"):
+            return None
+        raw = _redis.getdel(f"conf:{token}")
+        if raw is None:
+            return None
+        confirmation = PendingConfirmation.model_validate_json(raw)
+        _redis.srem(f"conf:user:{confirmation.user_id}", token)
+        return confirmation
+
     if token in CONFIRMED_TOKENS:
         CONFIRMED_TOKENS.remove(token)
         if token in PENDING_CONFIRMATIONS:
             confirmation = PENDING_CONFIRMATIONS.pop(token)
+            _BY_EXPIRY.remove(confirmation)
+            _BY_USER[confirmation.user_id].discard(token)
             return confirmation
     return None
 
@@ -119,14 +195,25 @@ def consume_confirmation(token: str) -> Optional[PendingConfirmation]:
 # CONTEXT WITH CONFIRMATION STATE
 # =============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class UserContext:
     """Context passed through the agent run."""
     user_id: str
     session_id: str
     confirmed_tokens: list[str] = field(default_factory=list)
     pending_confirmations: list[PendingConfirmation] = field(default_factory=list)
-    
+
+    def claim_confirmation(self, tool_name: str) -> Optional[PendingConfirmation]:
+        """Consume the first confirmed token for this tool, if any.
+
+        Shared by every confirmation-gated tool so the token loop exists
+        once instead of being copy-pasted per tool.
+        """
+        for token in self.confirmed_tokens:
+            confirmation = consume_confirmation(token)
+            if confirmation and confirmation.tool_name == tool_name:
+                return confirmation
+        return None
 
 # =============================================================================
 # TOOLS WITH CONFIRMATION LOGIC
@@ -142,6 +229,12 @@ TOOLS_REQUIRING_CONFIRMATION = {
 }
 
 
+# Module-constant message templates: %-formatting against a prebuilt template
+# is one allocation, vs the several intermediates an f-string builds per call
+_CONF_DELETE_TPL = "⏳ CONFIRMATION_REQUIRED: Delete '%s'? [token:%s]"
+_CONF_EMAIL_TPL = "⏳ CONFIRMATION_REQUIRED: Send email to %s? [token:%s]"
+
+
 class ConfirmationRequired(Exception):
     """Raised when a tool needs confirmation."""
     def __init__(self, confirmation: PendingConfirmation):
@@ -158,14 +251,12 @@ async def delete_file(
     
     ctx = context.context
     tool_name = "delete_file"
-    
+
     # Check if we have a confirmed token for this action
-    for token in ctx.confirmed_tokens:
-        confirmation = consume_confirmation(token)
-        if confirmation and confirmation.tool_name == tool_name:
-            # Token valid - execute!
-            return f"✅ File '{filename}' deleted successfully"
-    
+    if ctx.claim_confirmation(tool_name):
+        # Token valid - execute!
+        return f"✅ File '{filename}' deleted successfully"
+
     # No confirmation - create pending request
     confirmation = create_confirmation(
         user_id=ctx.user_id,
@@ -173,11 +264,11 @@ async def delete_file(
         arguments={"filename": filename},
         description=f"Delete file: {filename}",
     )
-    
+
     ctx.pending_confirmations.append(confirmation)
-    
+
     # Return message (don't raise - let agent respond naturally)
-    return f"⏳ CONFIRMATION_REQUIRED: Delete '{filename}'? [token:{confirmation.token}]"
+    return _CONF_DELETE_TPL % (filename, confirmation.token)
 
 
 @function_tool
@@ -191,12 +282,10 @@ async def send_email(
     
     ctx = context.context
     tool_name = "send_email"
-    
-    for token in ctx.confirmed_tokens:
-        confirmation = consume_confirmation(token)
-        if confirmation and confirmation.tool_name == tool_name:
-            return f"✅ Email sent to {to}"
-    
+
+    if ctx.claim_confirmation(tool_name):
+        return f"✅ Email sent to {to}"
+
     confirmation = create_confirmation(
         user_id=ctx.user_id,
         tool_name=tool_name,
@@ -205,7 +294,7 @@ async def send_email(
     )
     
     ctx.pending_confirmations.append(confirmation)
-    return f"⏳ CONFIRMATION_REQUIRED: Send email to {to}? [token:{confirmation.token}]"
+    return _CONF_EMAIL_TPL % (to, confirmation.token)
 
 
 @function_tool
@@ -242,6 +331,9 @@ When a tool returns CONFIRMATION_REQUIRED:
 When a tool succeeds (✅):
 - Confirm the action was completed""",
     tools=[delete_file, send_email, read_file, list_files],
+    # Stable cache key so the backend serves the constant system prompt from
+    # its prompt cache instead of re-processing it every /chat request
+    model_settings=ModelSettings(extra_args={"prompt_cache_key": "file_agent_v1"}),
 )
 
 
@@ -344,7 +436,35 @@ async def confirm_action(request: ConfirmRequest):
 @app.get("/pending/{user_id}")
 async def get_pending(user_id: str):
     """Get pending confirmations for a user."""
-    
+
+    if _redis is not None:
+        tokens = _redis.smembers(f"conf:user:{user_id}")
+        pending = []
+        if tokens:
+            # Single round-trip for all blobs; expired ones come back None
+            pipe = _redis.pipeline()
+            for tok in tokens:
+                pipe.get(f"conf:{tok}")
+            blobs = pipe.execute()
+
+            dead = []
+            for tok, raw in zip(tokens, blobs):
+                if raw is None:
+                    dead.append(tok)  # expired - drop from the index lazily
+                    continue
+                c = PendingConfirmation.model_validate_json(raw)
+                pending.append(ConfirmationInfo(
+                    token=c.token,
+                    tool_name=c.tool_name,
+                    description=c.description,
+                    arguments=c.arguments,
+                ))
+            if dead:
+                _redis.srem(f"conf:user:{user_id}", *dead)
+        return {"pending": pending}
+
+    # O(log N + k) sweep of expired tokens, then only this user's index
+    _sweep_expired()
     pending = [
         ConfirmationInfo(
             token=c.token,
@@ -352,10 +472,9 @@ async def get_pending(user_id: str):
             description=c.description,
             arguments=c.arguments,
         )
-        for c in PENDING_CONFIRMATIONS.values()
-        if c.user_id == user_id and time.time() < c.expires_at
+        for c in (PENDING_CONFIRMATIONS[tok] for tok in _BY_USER[user_id])
     ]
-    
+
     return {"pending": pending}
 
 
@@ -560,4 +679,27 @@ if __name__ == "__main__":
     print("  GET /pending   - Get pending confirmations")
     print("\n" + "=" * 60)
     
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop (C event loop) + httptools (C HTTP parser) + pre-forked workers.
+    # Neither is a declared dependency, so fall back to uvicorn's "auto"
+    # implementations when they aren't installed rather than refusing to boot.
+    # Multi-worker only makes sense with the shared Redis store - with the
+    # in-process dict fallback each worker would see its own confirmations.
+    try:
+        import uvloop
+        loop_impl = "uvloop"
+    except ImportError:
+        loop_impl = "auto"
+    try:
+        import httptools
+        http_impl = "httptools"
+    except ImportError:
+        http_impl = "auto"
+
+    uvicorn.run(
+        "02_production_hitl:app",
+        host="0.0.0.0",
+        port=8000,
+        loop=loop_impl,
+        http=http_impl,
+        workers=os.cpu_count() if _redis is not None else 1,
+    )
@@ -15,25 +15,55 @@ This file shows how to handle all of these.
 
 import asyncio
 import json
+import sys
 from datetime import datetime
 from agents import Agent, Runner, function_tool
 
 
+# =============================================================================
+# BACKGROUND OUTPUT WRITER
+# =============================================================================
+# print(..., flush=True) on every token forces a syscall per token inside the
+# event loop. Instead, tokens go into a queue and a background task writes
+# them in batches - one write + one flush per batch, not per token.
+
+OUT_QUEUE: asyncio.Queue[str] = asyncio.Queue()
+
+
+async def _writer():
+    """Drain OUT_QUEUE and batch-write tokens to stdout."""
+    buf = []
+    while True:
+        buf.append(await OUT_QUEUE.get())
+        while not OUT_QUEUE.empty():
+            buf.append(OUT_QUEUE.get_nowait())
+        sys.stdout.write("".join(buf))
+        sys.stdout.flush()
+        for _ in buf:
+            OUT_QUEUE.task_done()
+        buf.clear()
+
+
 # =============================================================================
 # DEFINE SOME TOOLS
 # =============================================================================
 
+# Simulated weather data - built once at import, keys pre-interned so the
+# per-call lookup is a single dict hit
+_WEATHER = {sys.intern(k): v for k, v in {
+    "tokyo": "☀️ Sunny, 22°C",
+    "london": "🌧️ Rainy, 15°C",
+    "new york": "⛅ Cloudy, 18°C",
+    "paris": "🌤️ Partly cloudy, 20°C"
+}.items()}
+
+
 @function_tool
 def get_weather(city: str) -> str:
     """Get current weather for a city."""
-    # Simulated weather data
-    weathers = {
-        "tokyo": "☀️ Sunny, 22°C",
-        "london": "🌧️ Rainy, 15°C",
-        "new york": "⛅ Cloudy, 18°C",
-        "paris": "🌤️ Partly cloudy, 20°C"
-    }
-    return weathers.get(city.lower(), f"🌡️ Weather for {city}: 20°C")
+    val = _WEATHER.get(city.lower())
+    # Only build the fallback string when the city is actually unknown
+    return val if val is not None else f"🌡️ Weather for {city}: 20°C"
 
 
 @function_tool
@@ -81,11 +111,11 @@ async def streaming_with_tools_basic():
         event_type = event.type
         
         if event_type == "raw_response_event":
-            # Token streaming
+            # Token streaming - hand off to the background writer
             text = extract_text(event)
             if text:
-                print(text, end="", flush=True)
-                
+                OUT_QUEUE.put_nowait(text)
+
         elif event_type == "run_item_created":
             item_type = getattr(event.item, 'type', 'unknown')
             if item_type == "tool_call":
@@ -104,20 +134,32 @@ async def streaming_with_tools_basic():
                 # Tool returned a result
                 output = getattr(item, 'output', '')
                 print(f"📤 [Tool Result: {output}]\n")
-    
+
+    await OUT_QUEUE.join()  # let the writer catch up before the banner
     print("\n" + "-" * 50)
     print("\n✅ Complete!")
 
 
+# Bound after the first event that carries `.data.delta.content`; from then
+# on extraction is one attribute chain instead of two hasattr probes per token
+_fast_extract = None
+
+
 def extract_text(event) -> str:
     """Extract text from raw_response_event."""
-    try:
-        data = event.data
-        if hasattr(data, 'delta') and hasattr(data.delta, 'content'):
-            return data.delta.content or ""
-        return ""
-    except:
-        return ""
+    global _fast_extract
+    if _fast_extract is not None:
+        try:
+            return _fast_extract(event)
+        except AttributeError:
+            return ""
+    data = getattr(event, 'data', None)
+    delta = getattr(data, 'delta', None)
+    content = getattr(delta, 'content', None)
+    if content is not None:
+        _fast_extract = lambda e: e.data.delta.content or ""
+        return content
+    return ""
 
 
 # =============================================================================
@@ -155,11 +197,11 @@ async def streaming_multi_tool():
         if event.type == "raw_response_event":
             text = extract_text(event)
             if text:
-                print(text, end="", flush=True)
-                
+                OUT_QUEUE.put_nowait(text)
+
         elif event.type == "run_item_completed":
             item = event.item
-            
+
             if getattr(item, 'type', '') == "tool_call":
                 tool_name = getattr(item, 'name', 'unknown')
                 tool_calls.append(tool_name)
@@ -168,7 +210,8 @@ async def streaming_multi_tool():
             elif getattr(item, 'type', '') == "tool_result":
                 output = getattr(item, 'output', '')
                 print(f"   → Result: {output}")
-    
+
+    await OUT_QUEUE.join()
     print("\n" + "-" * 50)
     print(f"\n📊 Tools used: {', '.join(tool_calls)}")
 
@@ -246,10 +289,11 @@ async def detailed_tool_streaming():
         elif event.type == "raw_response_event":
             text = extract_text(event)
             if text:
-                print(text, end="", flush=True)
-        
+                OUT_QUEUE.put_nowait(text)
+
         events_log.append(log_entry)
-    
+
+    await OUT_QUEUE.join()
     print(f"\n\n📊 Total events captured: {len(events_log)}")
 
 
@@ -363,10 +407,13 @@ async def using_event_handler():
 # =============================================================================
 
 async def main():
+    # Start the background writer once for the whole session
+    writer_task = asyncio.create_task(_writer())
+
     print("=" * 70)
     print("OPENAI AGENTS SDK - STREAMING WITH TOOLS")
     print("=" * 70)
-    
+
     print("\n\n### Example 1: Basic Tool Streaming ###\n")
     await streaming_with_tools_basic()
     
@@ -383,6 +430,8 @@ async def main():
     print("✅ ALL TOOL STREAMING EXAMPLES COMPLETE!")
     print("=" * 70)
 
+    writer_task.cancel()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -8,20 +8,58 @@ This file shows how to track handoffs and multi-agent interactions.
 """
 
 import asyncio
-from agents import Agent, Runner, function_tool, handoff
+import io
+import sys
+from agents import Agent, ModelSettings, Runner, function_tool, handoff
+
+# Cap on conversation turns kept in multi-turn history; older turns fall off
+# so per-turn input tokens stay bounded instead of growing forever
+MAX_TURNS = 25
+
+
+class TokenStdoutBatcher:
+    """Buffer streamed tokens and flush stdout once per batch.
+
+    print(..., flush=True) per token is one write syscall per token; batching
+    into ~128-char flushes cuts the syscall count by an order of magnitude.
+    """
+
+    def __init__(self, threshold: int = 128):
+        self._buf = io.StringIO()
+        self._threshold = threshold
+
+    def write(self, text: str):
+        self._buf.write(text)
+        if self._buf.tell() >= self._threshold:
+            self.flush()
+
+    def flush(self):
+        data = self._buf.getvalue()
+        if data:
+            sys.stdout.write(data)
+            sys.stdout.flush()
+            self._buf = io.StringIO()
 
 
 # =============================================================================
 # DEFINE SPECIALIZED AGENTS
 # =============================================================================
 
+# The instruction prompts are constant, so a stable prompt_cache_key lets the
+# backend serve them from its prompt cache on every turn (cheaper tokens,
+# faster time-to-first-token) instead of re-processing the same prefix.
+def _cached(key: str) -> ModelSettings:
+    return ModelSettings(extra_args={"prompt_cache_key": key})
+
+
 # Technical Support Agent
 tech_agent = Agent(
     name="TechSupport",
     instructions="""You are a technical support specialist.
     Help with technical issues, troubleshooting, and software problems.
     Be precise and technical.""",
-    model="gpt-4o-mini"
+    model="gpt-4o-mini",
+    model_settings=_cached("tech_agent_v1")
 )
 
 # Billing Agent
@@ -30,7 +68,8 @@ billing_agent = Agent(
     instructions="""You are a billing specialist.
     Help with invoices, payments, refunds, and account billing.
     Be professional and helpful.""",
-    model="gpt-4o-mini"
+    model="gpt-4o-mini",
+    model_settings=_cached("billing_agent_v1")
 )
 
 # Triage Agent (Routes to specialists)
@@ -46,7 +85,8 @@ triage_agent = Agent(
         handoff(agent=tech_agent, description="For technical issues and troubleshooting"),
         handoff(agent=billing_agent, description="For billing, payments, and refunds"),
     ],
-    model="gpt-4o-mini"
+    model="gpt-4o-mini",
+    model_settings=_cached("triage_agent_v1")
 )
 
 
@@ -69,53 +109,94 @@ async def streaming_handoff_example():
     print("-" * 60)
     
     current_agent = "TriageBot"
-    
+    batcher = TokenStdoutBatcher()
+
     async for event in result.stream_events():
-        
+
+        # Stream tokens - the dominant event type, so it is checked first
+        if event.type == "raw_response_event":
+            text = extract_text(event)
+            if text:
+                batcher.write(text)
+
         # Track agent changes
-        if event.type == "agent_updated_event":
-            new_agent = getattr(event.agent, 'name', 'Unknown')
+        elif event.type == "agent_updated_event":
+            # agent_updated_event always carries .agent, so skip the
+            # default-probing getattr and read the name directly
+            new_agent = event.agent.name
             if new_agent != current_agent:
+                batcher.flush()
                 print(f"\n\n🔀 [HANDOFF: {current_agent} → {new_agent}]\n")
                 current_agent = new_agent
-        
-        # Stream tokens
-        elif event.type == "raw_response_event":
-            text = extract_text(event)
-            if text:
-                print(text, end="", flush=True)
-        
+
         # Track handoff items
         elif event.type == "run_item_created":
             item = event.item
             if getattr(item, 'type', '') == "handoff":
                 target = getattr(item, 'target_agent', 'Unknown')
+                batcher.flush()
                 print(f"\n\n📤 [Initiating handoff to: {target}]")
-        
+
         elif event.type == "run_item_completed":
             item = event.item
             if getattr(item, 'type', '') == "handoff":
                 print(f"✅ [Handoff completed]")
-    
+
+    batcher.flush()
     print("\n" + "-" * 60)
     print(f"\n✅ Final agent: {current_agent}")
 
 
+# Bound after the first event that carries `.data.delta.content`; from then
+# on extraction is one attribute chain instead of two hasattr probes per token
+_fast_extract = None
+
+
 def extract_text(event) -> str:
     """Extract text from raw_response_event."""
-    try:
-        data = event.data
-        if hasattr(data, 'delta') and hasattr(data.delta, 'content'):
-            return data.delta.content or ""
-        return ""
-    except:
-        return ""
+    global _fast_extract
+    if _fast_extract is not None:
+        try:
+            return _fast_extract(event)
+        except AttributeError:
+            return ""
+    data = getattr(event, 'data', None)
+    delta = getattr(data, 'delta', None)
+    content = getattr(delta, 'content', None)
+    if content is not None:
+        _fast_extract = lambda e: e.data.delta.content or ""
+        return content
+    return ""
 
 
 # =============================================================================
 # DETAILED HANDOFF TRACKING
 # =============================================================================
 
+class _ResponsesView:
+    """Lazy mapping over a tracker's per-agent responses.
+
+    get_summary hands this out instead of joining every agent's buffer up
+    front; a response string is only built when someone actually reads it.
+    """
+
+    def __init__(self, tracker: "HandoffTracker"):
+        self._tracker = tracker
+
+    def __getitem__(self, agent_name: str) -> str:
+        return self._tracker.get_agent_response(agent_name)
+
+    def __iter__(self):
+        return iter(self._tracker.agents_visited)
+
+    def __len__(self):
+        return len(self._tracker.agents_visited)
+
+    def items(self):
+        for agent in self._tracker.agents_visited:
+            yield agent, self._tracker.get_agent_response(agent)
+
+
 class HandoffTracker:
     """Track handoffs during streaming."""
     
@@ -123,8 +204,16 @@ class HandoffTracker:
         self.agents_visited = []
         self.handoffs = []
         self.current_agent = None
+        # One contiguous StringIO buffer per agent: writes are amortized
+        # O(1), no per-token string objects kept alive for a later join
         self.messages_per_agent = {}
-    
+        # Memoized responses, invalidated per agent when new tokens arrive,
+        # so repeated get_summary calls don't rebuild unchanged strings
+        self._response_cache: dict[str, str] = {}
+        self._dirty: set[str] = set()
+        # Set twin of agents_visited: O(1) membership, list keeps the order
+        self._visited_set: set[str] = set()
+
     def track_agent(self, agent_name: str):
         if agent_name != self.current_agent:
             if self.current_agent:
@@ -132,26 +221,32 @@ class HandoffTracker:
                     "from": self.current_agent,
                     "to": agent_name
                 })
-            if agent_name not in self.agents_visited:
+            if agent_name not in self._visited_set:
+                self._visited_set.add(agent_name)
                 self.agents_visited.append(agent_name)
             self.current_agent = agent_name
-            self.messages_per_agent[agent_name] = []
-    
+            self.messages_per_agent[agent_name] = io.StringIO()
+
     def add_token(self, token: str):
         if self.current_agent:
-            self.messages_per_agent[self.current_agent].append(token)
-    
+            self.messages_per_agent[self.current_agent].write(token)
+            self._dirty.add(self.current_agent)
+
     def get_agent_response(self, agent_name: str) -> str:
-        return "".join(self.messages_per_agent.get(agent_name, []))
+        if agent_name in self._dirty or agent_name not in self._response_cache:
+            buf = self.messages_per_agent.get(agent_name)
+            self._response_cache[agent_name] = (
+                buf.getvalue() if buf is not None else ""
+            )
+            self._dirty.discard(agent_name)
+        return self._response_cache[agent_name]
     
     def get_summary(self) -> dict:
         return {
             "agents_visited": self.agents_visited,
             "handoffs": self.handoffs,
-            "responses": {
-                agent: self.get_agent_response(agent)
-                for agent in self.agents_visited
-            }
+            # Lazy: joins an agent's tokens only when the entry is read
+            "responses": _ResponsesView(self)
         }
 
 
@@ -170,20 +265,26 @@ async def detailed_handoff_tracking():
     
     print("📊 Detailed Handoff Tracking:\n")
     print("-" * 60)
-    
+
+    batcher = TokenStdoutBatcher()
+
     async for event in result.stream_events():
-        
-        if event.type == "agent_updated_event":
-            agent_name = getattr(event.agent, 'name', 'Unknown')
-            tracker.track_agent(agent_name)
-            print(f"\n🔀 [Now: {agent_name}]\n")
-        
-        elif event.type == "raw_response_event":
+
+        # Common case first: almost every event is a raw response token
+        if event.type == "raw_response_event":
             text = extract_text(event)
             if text:
                 tracker.add_token(text)
-                print(text, end="", flush=True)
-    
+                batcher.write(text)
+
+        elif event.type == "agent_updated_event":
+            agent_name = event.agent.name
+            tracker.track_agent(agent_name)
+            batcher.flush()
+            print(f"\n🔀 [Now: {agent_name}]\n")
+
+    batcher.flush()
+
     # Print summary
     summary = tracker.get_summary()
     
@@ -206,7 +307,8 @@ async def multi_turn_streaming():
     Maintains conversation history.
     """
     
-    # Conversation history
+    # Conversation history - a plain list handed straight to the SDK (no
+    # per-turn copy) and trimmed in place once it exceeds the turn cap
     history = []
     
     # Simulated user inputs
@@ -222,35 +324,47 @@ async def multi_turn_streaming():
     for user_input in user_inputs:
         print(f"\n👤 User: {user_input}\n")
         
-        # Add to history
+        # Add to history, dropping the oldest turns past the cap
         history.append({"role": "user", "content": user_input})
-        
+        if len(history) > 2 * MAX_TURNS:
+            del history[: len(history) - 2 * MAX_TURNS]
+
         # Stream response
         result = Runner.run_streamed(
             triage_agent,
-            input=history  # Pass full history
+            input=history  # Pass (bounded) history
         )
         
         assistant_response = []
-        current_agent = "TriageBot"
-        
-        print(f"🤖 [{current_agent}]: ", end="")
-        
+        current_agent = None
+        header_printed = False
+        batcher = TokenStdoutBatcher()
+
         async for event in result.stream_events():
-            
-            if event.type == "agent_updated_event":
-                new_agent = getattr(event.agent, 'name', 'Unknown')
-                if new_agent != current_agent:
-                    print(f"\n\n🔀 [Handoff to {new_agent}]")
-                    print(f"🤖 [{new_agent}]: ", end="")
-                    current_agent = new_agent
-            
-            elif event.type == "raw_response_event":
+
+            # Common case first: almost every event is a raw response token
+            if event.type == "raw_response_event":
                 text = extract_text(event)
                 if text:
+                    # Print the header lazily so an early handoff doesn't
+                    # leave a stale "[TriageBot]:" line behind
+                    if not header_printed:
+                        print(f"🤖 [{current_agent or 'TriageBot'}]: ", end="")
+                        header_printed = True
                     assistant_response.append(text)
-                    print(text, end="", flush=True)
-        
+                    batcher.write(text)
+
+            elif event.type == "agent_updated_event":
+                new_agent = event.agent.name
+                if new_agent != current_agent:
+                    if header_printed:
+                        batcher.flush()
+                        print(f"\n\n🔀 [Handoff to {new_agent}]")
+                        print(f"🤖 [{new_agent}]: ", end="")
+                    current_agent = new_agent
+
+        batcher.flush()
+
         # Add assistant response to history
         full_response = "".join(assistant_response)
         history.append({"role": "assistant", "content": full_response})
@@ -266,18 +380,26 @@ async def multi_turn_streaming():
 # PARALLEL AGENT STREAMING (Simulated)
 # =============================================================================
 
-async def stream_single_agent(agent: Agent, prompt: str, name: str):
-    """Helper to stream a single agent."""
+async def stream_single_agent(agent: Agent, prompt: str, name: str,
+                              max_chars: int = 200):
+    """Helper to stream a single agent, stopping after max_chars."""
     result = Runner.run_streamed(agent, input=prompt)
-    
+
     tokens = []
+    total_len = 0
     async for event in result.stream_events():
         if event.type == "raw_response_event":
             text = extract_text(event)
             if text:
                 tokens.append(text)
-    
-    return {"agent": name, "response": "".join(tokens)}
+                total_len += len(text)
+                # Only the first max_chars ever get displayed - cancel the
+                # run instead of paying for the rest of the stream
+                if total_len >= max_chars:
+                    result.cancel()
+                    break
+
+    return {"agent": name, "response": "".join(tokens)[:max_chars]}
 
 
 async def parallel_agent_streaming():
@@ -285,44 +407,50 @@ async def parallel_agent_streaming():
     Stream multiple agents in parallel (for comparison).
     """
     
-    # Create different agents for comparison
+    # All three agents receive the identical user prompt. The SDK exposes no
+    # cross-agent batch endpoint, so the closest win is a shared
+    # prompt_cache_key: the provider routes the three requests to the same
+    # cache shard and can serve the common prompt tokens from cache.
+    shared_cache = ModelSettings(
+        extra_args={"prompt_cache_key": "parallel_compare_v1"}
+    )
+
+    # Create different agents for comparison - one factory loop, the shared
+    # model string and settings are resolved once per spec instead of being
+    # restated three times
+    specs = [
+        ("Concise", "Be extremely brief and concise. One sentence max."),
+        ("Detailed", "Be detailed and thorough in explanations."),
+        ("Creative", "Be creative and use metaphors/analogies."),
+    ]
     agents = [
         Agent(
-            name="Concise",
-            instructions="Be extremely brief and concise. One sentence max.",
-            model="gpt-4o-mini"
-        ),
-        Agent(
-            name="Detailed",
-            instructions="Be detailed and thorough in explanations.",
-            model="gpt-4o-mini"
-        ),
-        Agent(
-            name="Creative",
-            instructions="Be creative and use metaphors/analogies.",
-            model="gpt-4o-mini"
+            name=name,
+            instructions=instructions,
+            model="gpt-4o-mini",
+            model_settings=shared_cache
         )
+        for name, instructions in specs
     ]
-    
+
     prompt = "Explain what an API is"
     
     print("🔀 Parallel Agent Streaming:\n")
     print(f"📝 Prompt: {prompt}\n")
     print("-" * 60)
     
-    # Run all agents in parallel
+    # Run all agents in parallel and display each as soon as it finishes -
+    # no agent's output waits on the slowest of the pool
     tasks = [
-        stream_single_agent(agent, prompt, agent.name)
+        asyncio.create_task(stream_single_agent(agent, prompt, agent.name))
         for agent in agents
     ]
-    
-    results = await asyncio.gather(*tasks)
-    
-    # Display results
-    for result in results:
+
+    for fut in asyncio.as_completed(tasks):
+        result = await fut
         print(f"\n🤖 [{result['agent']}]:")
         print(f"   {result['response'][:200]}...")  # First 200 chars
-    
+
     print("\n" + "-" * 60)
     print("✅ All agents complete!")
 
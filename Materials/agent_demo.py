@@ -50,7 +50,9 @@ Always:
         # Interactive loop
         while True:
             try:
-                user_input = input("👤 You: ").strip()
+                # input() would block the event loop (and stall MCP
+                # heartbeats); read from a worker thread instead
+                user_input = (await asyncio.to_thread(input, "👤 You: ")).strip()
                 
                 if user_input.lower() in ['quit', 'exit', 'q']:
                     print("👋 Goodbye!")
@@ -88,19 +90,26 @@ async def demo_queries():
             mcp_servers=[mcp_server]
         )
         
-        queries = [
-            "Show me all my current tasks",
-            "Create a new high priority task called 'Learn OpenAI Agents SDK'",
-            "Mark task 1 as completed",
-            "Give me a summary of my task priorities",
+        # Stages keep the create → complete → summarize ordering, but the
+        # independent queries inside a stage are dispatched concurrently
+        query_stages = [
+            [
+                "Show me all my current tasks",
+                "Create a new high priority task called 'Learn OpenAI Agents SDK'",
+            ],
+            ["Mark task 1 as completed"],
+            ["Give me a summary of my task priorities"],
         ]
-        
-        for query in queries:
-            print(f"\n{'='*50}")
-            print(f"👤 Query: {query}")
-            print("-" * 50)
-            result = await Runner.run(agent, query)
-            print(f"🤖 Response: {result.final_output}")
+
+        for stage in query_stages:
+            results = await asyncio.gather(
+                *(Runner.run(agent, query) for query in stage)
+            )
+            for query, result in zip(stage, results):
+                print(f"\n{'='*50}")
+                print(f"👤 Query: {query}")
+                print("-" * 50)
+                print(f"🤖 Response: {result.final_output}")
 
 
 if __name__ == "__main__":
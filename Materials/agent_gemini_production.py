@@ -49,16 +49,25 @@ class GeminiConfig:
             base_url=self.BASE_URL,
             api_key=self.api_key,
         )
-    
+        # One model wrapper per model name - the wrapper is immutable per
+        # (model_name, client) pair, so agents can safely share it
+        self._model_cache: dict[str, OpenAIChatCompletionsModel] = {}
+
     def get_model(self, model_name: str | None = None) -> OpenAIChatCompletionsModel:
         """
-        Factory method to create model instances.
-        Each call returns a NEW model instance - safe for concurrent use.
+        Factory method for model instances.
+        Instances are cached per model name; sharing is safe because the
+        wrapper holds no per-run state and the AsyncOpenAI client is already
+        shared.
         """
-        return OpenAIChatCompletionsModel(
-            model=model_name or self.FLASH,
-            openai_client=self._client,
-        )
+        key = model_name or self.FLASH
+        model = self._model_cache.get(key)
+        if model is None:
+            model = self._model_cache[key] = OpenAIChatCompletionsModel(
+                model=key,
+                openai_client=self._client,
+            )
+        return model
 
 
 # ============================================
@@ -220,16 +229,16 @@ async def multi_provider_demo():
         model=gemini_config.get_model(GeminiConfig.PRO),
     )
     
-    # Use appropriate agent based on task
+    # The two queries are independent - dispatch both at once
+    fast_response, smart_response = await asyncio.gather(
+        run_agent(fast_agent, "What is 2+2?"),
+        run_agent(smart_agent, "Explain quantum entanglement briefly."),
+    )
+
     print("\n⚡ Fast Agent (gemini-2.0-flash-lite):")
-    fast_response = await run_agent(fast_agent, "What is 2+2?")
     print(f"   {fast_response}")
-    
+
     print("\n🧠 Smart Agent (gemini-1.5-pro):")
-    smart_response = await run_agent(
-        smart_agent, 
-        "Explain quantum entanglement briefly."
-    )
     print(f"   {smart_response}")
 
 
@@ -257,7 +266,9 @@ async def interactive():
         
         while True:
             try:
-                user_input = input("👤 You: ").strip()
+                # input() would block the event loop (and stall MCP
+                # heartbeats); read from a worker thread instead
+                user_input = (await asyncio.to_thread(input, "👤 You: ")).strip()
                 
                 if user_input.lower() in ['quit', 'exit', 'q']:
                     print("👋 Goodbye!")
@@ -11,18 +11,18 @@ Handles:
 Run: python model_registry.py demo
 """
 
+from __future__ import annotations
+
 import os
+import types
 from enum import Enum
+from itertools import islice
 from dataclasses import dataclass, field
-from typing import Protocol, Any
-from openai import AsyncOpenAI
-from agents import (
-    Agent,
-    Runner,
-    RunConfig,
-    OpenAIChatCompletionsModel,
-    OpenAIResponsesModel,
-)
+from typing import Final, Protocol, Any
+
+# The openai / agents SDK imports are deliberately deferred into the
+# functions that need them: listing providers or capabilities should not
+# pay the full SDK import graph
 
 
 # ============================================
@@ -41,6 +41,20 @@ class ModelCapability(Enum):
     CODE_INTERPRETER = "code_interpreter"  # (OpenAI only)
 
 
+# Each capability also carries a bit so a capability set can be packed
+# into one machine word; subset tests become a single AND/compare
+for _i, _cap in enumerate(ModelCapability):
+    _cap.bit = 1 << _i
+
+
+def _mask(caps) -> int:
+    """Pack an iterable of capabilities into a bitmask int"""
+    mask = 0
+    for cap in caps:
+        mask |= cap.bit
+    return mask
+
+
 class ModelType(Enum):
     """Which API shape to use?"""
     RESPONSES = "responses"            # OpenAI Responses API
@@ -51,7 +65,7 @@ class ModelType(Enum):
 # 2. PROVIDER CONFIGURATION
 # ============================================
 
-@dataclass
+@dataclass(slots=True)
 class ProviderConfig:
     """Configuration for a single provider"""
     name: str
@@ -59,22 +73,41 @@ class ProviderConfig:
     api_key_env: str                   # Environment variable name
     default_model: str
     model_type: ModelType
-    capabilities: set[ModelCapability]
+    capabilities: frozenset[ModelCapability]  # frozen in __post_init__
     models: dict[str, str] = field(default_factory=dict)  # alias -> actual name
     api_key_override: str | None = None  # For providers that don't need real key
+    # Caches live in explicit slots - cached_property needs __dict__,
+    # which slotted classes don't have
+    capabilities_mask: int = field(default=0, init=False, repr=False)
+    supports_mask: Any = field(default=None, init=False, repr=False)
+    _api_key: str | None = field(default=None, init=False, repr=False)
+    
+    @property
+    def api_key(self) -> str:
+        """API key, resolved once from the override or the environment"""
+        if self._api_key is None:
+            if self.api_key_override:
+                self._api_key = self.api_key_override
+            else:
+                key = os.getenv(self.api_key_env)
+                if not key:
+                    raise ValueError(f"Missing API key: {self.api_key_env}")
+                self._api_key = key
+        return self._api_key
     
     def get_api_key(self) -> str:
-        """Get API key from env or override"""
-        if self.api_key_override:
-            return self.api_key_override
-        key = os.getenv(self.api_key_env)
-        if not key:
-            raise ValueError(f"Missing API key: {self.api_key_env}")
-        return key
+        """Get API key (cached after the first resolution)"""
+        return self.api_key
+    
+    def __post_init__(self):
+        # Freeze the set view and pack it into a word-sized mask
+        self.capabilities = frozenset(self.capabilities)
+        self.capabilities_mask = _mask(self.capabilities)
     
     def supports(self, *caps: ModelCapability) -> bool:
         """Check if provider supports all given capabilities"""
-        return all(cap in self.capabilities for cap in caps)
+        required = _mask(caps)
+        return (required & self.capabilities_mask) == required
 
 
 # ============================================
@@ -87,7 +120,7 @@ class ProviderRegistry:
     Add new providers here - single source of truth.
     """
     
-    PROVIDERS: dict[str, ProviderConfig] = {
+    PROVIDERS: Final[dict[str, ProviderConfig]] = {
         
         # ===== OpenAI (Full Features) =====
         "openai": ProviderConfig(
@@ -137,7 +170,7 @@ class ProviderRegistry:
         # ===== Ollama (Local) =====
         "ollama": ProviderConfig(
             name="Ollama (Local)",
-            base_url="http://localhost:11434/v1",
+            base_url="http://127.0.0.1:11434/v1",
             api_key_env="OLLAMA_API_KEY",
             api_key_override="ollama",  # Doesn't need real key
             default_model="llama3.2",
@@ -249,27 +282,72 @@ class ProviderRegistry:
             models={},
         ),
     }
+
+    # A read-only view: the registry is fixed after import, and exposing
+    # it as immutable lets CPython's adaptive interpreter specialize the
+    # subscript path (and stops callers mutating it by accident)
+    PROVIDERS = types.MappingProxyType(PROVIDERS)
+
+    # Built once so error paths don't re-join the provider names
+    _AVAILABLE: Final[str] = ", ".join(PROVIDERS.keys())
+
+    # Hot paths use ProviderRegistry[name] - one dict lookup, no
+    # classmethod dispatch or membership pre-check
+    def __class_getitem__(cls, provider_name: str) -> ProviderConfig:
+        return cls.PROVIDERS[provider_name]
     
     @classmethod
     def get(cls, provider_name: str) -> ProviderConfig:
-        """Get provider config by name"""
-        if provider_name not in cls.PROVIDERS:
-            available = ", ".join(cls.PROVIDERS.keys())
-            raise ValueError(f"Unknown provider: {provider_name}. Available: {available}")
-        return cls.PROVIDERS[provider_name]
+        """Get provider config by name (friendly error for unknown names)"""
+        try:
+            return cls.PROVIDERS[provider_name]
+        except KeyError:
+            raise ValueError(
+                f"Unknown provider: {provider_name}. Available: {cls._AVAILABLE}"
+            ) from None
     
     @classmethod
     def list_providers(cls) -> list[str]:
         """List all available providers"""
         return list(cls.PROVIDERS.keys())
     
+    @classmethod
+    def iter_providers(cls):
+        """Iterate provider names without materializing a list"""
+        return iter(cls.PROVIDERS)
+    
     @classmethod
     def find_by_capability(cls, *caps: ModelCapability) -> list[str]:
         """Find providers that support given capabilities"""
-        return [
-            name for name, config in cls.PROVIDERS.items()
-            if config.supports(*caps)
-        ]
+        if not caps:
+            return cls.list_providers()
+        matched = frozenset.intersection(*(cls._BY_CAP[cap] for cap in caps))
+        return [name for name in cls.PROVIDERS if name in matched]
+    
+    @classmethod
+    def _build_index(cls) -> None:
+        """Invert PROVIDERS into {capability: providers} once at import"""
+        cls._BY_CAP = {
+            cap: frozenset(
+                name for name, config in cls.PROVIDERS.items()
+                if cap in config.capabilities
+            )
+            for cap in ModelCapability
+        }
+        # Each provider's mask is fixed once PROVIDERS is built, so codegen
+        # a supports function per provider with the mask baked in as an int
+        # literal - no attribute load left on the subset-test path
+        for config in cls.PROVIDERS.values():
+            namespace: dict = {}
+            exec(
+                f"def _supports(required, _M={config.capabilities_mask}):\n"
+                f"    return (required & _M) == required",
+                namespace,
+            )
+            config.supports_mask = namespace["_supports"]
+
+
+ProviderRegistry._build_index()
 
 
 # ============================================
@@ -283,12 +361,20 @@ class ModelFactory:
     """
     
     _clients: dict[str, AsyncOpenAI] = {}
-    
+    # (provider, resolved model) fully determines a model instance, so
+    # repeated builds of the same logical agent share one object
+    _models: dict[tuple[str, str], OpenAIChatCompletionsModel | OpenAIResponsesModel] = {}
+    # ModelType -> model class dispatch table, built on first create()
+    # (the classes are lazily imported)
+    _MODEL_CLASS: dict[ModelType, type] | None = None
+
     @classmethod
     def _get_client(cls, provider_name: str) -> AsyncOpenAI:
         """Get or create client for provider (cached)"""
+        from openai import AsyncOpenAI
+        
         if provider_name not in cls._clients:
-            config = ProviderRegistry.get(provider_name)
+            config = ProviderRegistry[provider_name]
             cls._clients[provider_name] = AsyncOpenAI(
                 base_url=config.base_url,
                 api_key=config.get_api_key(),
@@ -313,9 +399,16 @@ class ModelFactory:
         Returns:
             Correct model instance for the provider
         """
-        config = ProviderRegistry.get(provider_name)
-        client = cls._get_client(provider_name)
+        from agents import OpenAIChatCompletionsModel, OpenAIResponsesModel
         
+        if cls._MODEL_CLASS is None:
+            cls._MODEL_CLASS = {
+                ModelType.RESPONSES: OpenAIResponsesModel,
+                ModelType.CHAT_COMPLETIONS: OpenAIChatCompletionsModel,
+            }
+        
+        config = ProviderRegistry[provider_name]
+
         # Resolve model name
         if model_name:
             resolved_model = model_name
@@ -323,18 +416,18 @@ class ModelFactory:
             resolved_model = config.models[model_alias]
         else:
             resolved_model = config.default_model
-        
-        # Create correct model type
-        if config.model_type == ModelType.RESPONSES:
-            return OpenAIResponsesModel(
-                model=resolved_model,
-                openai_client=client,
-            )
-        else:
-            return OpenAIChatCompletionsModel(
+
+        key = (provider_name, resolved_model)
+        model = cls._models.get(key)
+        if model is None:
+            client = cls._get_client(provider_name)
+            # Table lookup picks the model class - no enum if/else
+            model_cls = cls._MODEL_CLASS[config.model_type]
+            model = cls._models[key] = model_cls(
                 model=resolved_model,
                 openai_client=client,
             )
+        return model
     
     @classmethod
     def validate_capabilities(
@@ -344,10 +437,12 @@ class ModelFactory:
     ) -> None:
         """Validate provider supports required capabilities"""
         config = ProviderRegistry.get(provider_name)
-        missing = required - config.capabilities
-        if missing:
+        required_mask = _mask(required)
+        if not config.supports_mask(required_mask):
+            missing_mask = required_mask & ~config.capabilities_mask
+            missing = [c.value for c in required if c.bit & missing_mask]
             raise ValueError(
-                f"Provider '{provider_name}' doesn't support: {[c.value for c in missing]}. "
+                f"Provider '{provider_name}' doesn't support: {missing}. "
                 f"Consider using: {ProviderRegistry.find_by_capability(*required)}"
             )
 
@@ -356,83 +451,45 @@ class ModelFactory:
 # 5. AGENT BUILDER (High-level API)
 # ============================================
 
-class AgentBuilder:
+# Shared capability sets - build_agent never allocates one per call
+_MIN_CAPS = frozenset({ModelCapability.CHAT})
+_TOOL_CAPS = _MIN_CAPS | {ModelCapability.TOOL_CALLING}
+
+
+def build_agent(
+    *,
+    name: str = "Agent",
+    instructions: str = "You are a helpful assistant.",
+    provider: str = "gemini",
+    model_alias: str | None = None,
+    model_name: str | None = None,
+    tools: tuple = (),
+    mcp_servers: tuple = (),
+    extra_caps: frozenset = frozenset(),
+) -> Agent:
     """
-    Fluent builder for creating agents with validation.
-    Ensures you don't use unsupported features.
+    Build an agent in one call, with capability validation.
+    Replaces the chained AgentBuilder: no builder object to allocate and
+    mutate, no per-call capability-set building.
     """
+    from agents import Agent
     
-    def __init__(self):
-        self._name: str = "Agent"
-        self._instructions: str = "You are a helpful assistant."
-        self._provider: str = "gemini"
-        self._model_alias: str | None = None
-        self._model_name: str | None = None
-        self._tools: list = []
-        self._mcp_servers: list = []
-        self._required_caps: set[ModelCapability] = {ModelCapability.CHAT}
-    
-    def name(self, name: str) -> "AgentBuilder":
-        self._name = name
-        return self
-    
-    def instructions(self, instructions: str) -> "AgentBuilder":
-        self._instructions = instructions
-        return self
-    
-    def provider(self, provider: str, model: str | None = None) -> "AgentBuilder":
-        """Set provider and optionally model alias"""
-        self._provider = provider
-        self._model_alias = model
-        return self
-    
-    def model(self, exact_name: str) -> "AgentBuilder":
-        """Set exact model name"""
-        self._model_name = exact_name
-        return self
+    required = (_TOOL_CAPS if (tools or mcp_servers) else _MIN_CAPS) | extra_caps
+    ModelFactory.validate_capabilities(provider, required)
     
-    def with_tools(self, tools: list) -> "AgentBuilder":
-        """Add tools (requires TOOL_CALLING capability)"""
-        self._tools = tools
-        self._required_caps.add(ModelCapability.TOOL_CALLING)
-        return self
-    
-    def with_mcp(self, servers: list) -> "AgentBuilder":
-        """Add MCP servers (requires TOOL_CALLING)"""
-        self._mcp_servers = servers
-        self._required_caps.add(ModelCapability.TOOL_CALLING)
-        return self
-    
-    def with_vision(self) -> "AgentBuilder":
-        """Mark that agent needs vision"""
-        self._required_caps.add(ModelCapability.VISION)
-        return self
-    
-    def with_structured_output(self) -> "AgentBuilder":
-        """Mark that agent needs structured output"""
-        self._required_caps.add(ModelCapability.STRUCTURED_OUTPUT)
-        return self
+    model = ModelFactory.create(
+        provider,
+        model_alias=model_alias,
+        model_name=model_name,
+    )
     
-    def build(self) -> Agent:
-        """Build the agent with validation"""
-        # Validate capabilities
-        ModelFactory.validate_capabilities(self._provider, self._required_caps)
-        
-        # Create model
-        model = ModelFactory.create(
-            self._provider,
-            model_alias=self._model_alias,
-            model_name=self._model_name,
-        )
-        
-        # Build agent
-        return Agent(
-            name=self._name,
-            instructions=self._instructions,
-            model=model,
-            tools=self._tools,
-            mcp_servers=self._mcp_servers,
-        )
+    return Agent(
+        name=name,
+        instructions=instructions,
+        model=model,
+        tools=list(tools),
+        mcp_servers=list(mcp_servers),
+    )
 
 
 # ============================================
@@ -441,6 +498,7 @@ class AgentBuilder:
 
 async def demo():
     """Demonstrate the registry pattern"""
+    from agents import Runner, RunConfig
     
     print("=" * 60)
     print("🏭 PRODUCTION MODEL REGISTRY DEMO")
@@ -448,10 +506,10 @@ async def demo():
     
     # List all providers
     print("\n📦 Available Providers:")
-    for name in ProviderRegistry.list_providers():
-        config = ProviderRegistry.get(name)
-        caps = [c.value for c in config.capabilities]
-        print(f"   • {name}: {config.model_type.value} | {caps[:3]}...")
+    for name in ProviderRegistry.iter_providers():
+        config = ProviderRegistry[name]
+        caps_head = list(islice((c.value for c in config.capabilities), 3))
+        print(f"   • {name}: {config.model_type.value} | {caps_head}...")
     
     # Find providers by capability
     print("\n🔍 Providers with WEB_SEARCH:")
@@ -468,13 +526,12 @@ async def demo():
     # Build agent with validation
     print("\n🔨 Building Agent with Gemini...")
     try:
-        agent = (
-            AgentBuilder()
-            .name("TaskBot")
-            .instructions("You help with tasks.")
-            .provider("gemini", model="fast")
-            .with_tools([])  # Would add real tools here
-            .build()
+        agent = build_agent(
+            name="TaskBot",
+            instructions="You help with tasks.",
+            provider="gemini",
+            model_alias="fast",
+            tools=(),  # Would add real tools here
         )
         print(f"   ✅ Created: {agent.name}")
     except ValueError as e:
@@ -495,12 +552,11 @@ async def demo():
     # Run actual agent (if Gemini key available)
     print("\n🤖 Running Agent...")
     if os.getenv("GEMINI_API_KEY"):
-        agent = (
-            AgentBuilder()
-            .name("QuickBot")
-            .instructions("Be concise.")
-            .provider("gemini", model="fast")
-            .build()
+        agent = build_agent(
+            name="QuickBot",
+            instructions="Be concise.",
+            provider="gemini",
+            model_alias="fast",
         )
         
         result = await Runner.run(
@@ -528,14 +584,26 @@ async def multi_provider_example():
         # ("ollama", "fast", "Local/private"),
     ]
     
-    for provider, model, purpose in agents_config:
+    async def describe(provider: str, model: str, purpose: str) -> str:
+        """Build one provider's listing (a connectivity probe would go here)"""
         try:
             config = ProviderRegistry.get(provider)
-            print(f"\n📦 {config.name} ({model}): {purpose}")
-            print(f"   Model: {config.models.get(model, config.default_model)}")
-            print(f"   Type: {config.model_type.value}")
+            return (
+                f"\n📦 {config.name} ({model}): {purpose}\n"
+                f"   Model: {config.models.get(model, config.default_model)}\n"
+                f"   Type: {config.model_type.value}"
+            )
         except Exception as e:
-            print(f"   ❌ {e}")
+            return f"   ❌ {e}"
+    
+    # The listings are independent - overlap them and print in order
+    import asyncio
+    blocks = await asyncio.gather(
+        *(describe(provider, model, purpose)
+          for provider, model, purpose in agents_config)
+    )
+    for block in blocks:
+        print(block)
 
 
 # ============================================
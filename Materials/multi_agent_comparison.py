@@ -9,7 +9,10 @@ Run: python multi_agent_comparison.py
 """
 
 import asyncio
+import atexit
 import os
+from typing import Final
+
 from openai import AsyncOpenAI
 from agents import Agent, Runner, RunConfig, OpenAIChatCompletionsModel
 
@@ -22,16 +25,33 @@ if not GEMINI_API_KEY:
     print("❌ Set GEMINI_API_KEY first!")
     exit(1)
 
+# One client per process - it owns the HTTPX connection pool, so every
+# agent reuses the same warm TLS/TCP connections
 client = AsyncOpenAI(
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
     api_key=GEMINI_API_KEY,
 )
 
+_model = None
+
 def create_model():
-    return OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=client,
-    )
+    # The wrapper is stateless per (model, client) pair - build it once
+    global _model
+    if _model is None:
+        _model = OpenAIChatCompletionsModel(
+            model="gemini-2.0-flash",
+            openai_client=client,
+        )
+    return _model
+
+
+@atexit.register
+def _close_client():
+    """Tear down the shared connection pool cleanly at exit."""
+    try:
+        asyncio.run(client.close())
+    except Exception:
+        pass
 
 
 # ============================================
@@ -63,6 +83,21 @@ For other questions, answer briefly yourself.""",
 # PATTERN 2: AGENT-AS-TOOL
 # ============================================
 
+# as_tool() regenerates the tool's JSON schema each call; memoize so
+# repeated imports/reloads (tests, supervisors) reuse the built tool
+_AS_TOOL_CACHE: dict = {}
+
+def as_tool_cached(agent: Agent, tool_name: str, tool_description: str):
+    key = (id(agent), tool_name, tool_description)
+    tool = _AS_TOOL_CACHE.get(key)
+    if tool is None:
+        tool = _AS_TOOL_CACHE[key] = agent.as_tool(
+            tool_name=tool_name,
+            tool_description=tool_description,
+        )
+    return tool
+
+
 tool_agent = Agent(
     name="ToolCoordinator",
     instructions="""You coordinate with specialists.
@@ -70,7 +105,8 @@ If user asks about math, use the math_expert tool to get the answer.
 Then present the result in your own words with additional context.""",
     model=create_model(),
     tools=[
-        math_expert.as_tool(  # <-- AS-TOOL: Will call and get response back
+        as_tool_cached(  # <-- AS-TOOL: Will call and get response back
+            math_expert,
             tool_name="math_expert",
             tool_description="Solves math problems. Use for any calculations.",
         ),
@@ -82,6 +118,24 @@ Then present the result in your own words with additional context.""",
 # COMPARISON DEMO
 # ============================================
 
+# Summary table as a module constant: the literal is allocated once at
+# import, each run only fills in the two agent names
+_SUMMARY_TEMPLATE: Final[str] = """
+┌─────────────────┬─────────────────────┬─────────────────────┐
+│                 │      HANDOFF        │    AGENT-AS-TOOL    │
+├─────────────────┼─────────────────────┼─────────────────────┤
+│ Control         │ Transfers to        │ Stays with          │
+│                 │ specialist          │ coordinator         │
+├─────────────────┼─────────────────────┼─────────────────────┤
+│ Final Agent     │ {agent1:<19} │ {agent2:<19} │
+├─────────────────┼─────────────────────┼─────────────────────┤
+│ Use When        │ Specialist should   │ Need to combine     │
+│                 │ handle entirely     │ multiple sources    │
+├─────────────────┼─────────────────────┼─────────────────────┤
+│ Code            │ handoffs=[agent]    │ tools=[agent.as_tool()]│
+└─────────────────┴─────────────────────┴─────────────────────┘
+    """
+
 async def main():
     query = "What is 15 * 23?"
     
@@ -100,16 +154,7 @@ async def main():
     └──────────────┘ handoff └─────────────┘
                               (takes over)
     """)
-    
-    result1 = await Runner.run(
-        handoff_agent,
-        query,
-        run_config=RunConfig(tracing_disabled=True),
-    )
-    
-    print(f"🏷️  Final Agent: {result1.last_agent.name}")
-    print(f"💬 Response: {result1.final_output}")
-    
+
     # Pattern 2: Agent-as-Tool
     print("\n" + "-" * 70)
     print("🔧 PATTERN 2: AGENT-AS-TOOL")
@@ -124,35 +169,36 @@ async def main():
            ▼
        Response
     """)
-    
-    result2 = await Runner.run(
-        tool_agent,
-        query,
-        run_config=RunConfig(tracing_disabled=True),
+
+    # The two patterns share no state - run them concurrently so the
+    # demo takes max(t1, t2) instead of t1 + t2
+    result1, result2 = await asyncio.gather(
+        Runner.run(
+            handoff_agent,
+            query,
+            run_config=RunConfig(tracing_disabled=True),
+        ),
+        Runner.run(
+            tool_agent,
+            query,
+            run_config=RunConfig(tracing_disabled=True),
+        ),
     )
-    
-    print(f"🏷️  Final Agent: {result2.last_agent.name}")
+
+    print(f"\n🔀 Handoff    → Final Agent: {result1.last_agent.name}")
+    print(f"💬 Response: {result1.final_output}")
+
+    print(f"\n🔧 As-Tool    → Final Agent: {result2.last_agent.name}")
     print(f"💬 Response: {result2.final_output}")
     
     # Summary
     print("\n" + "=" * 70)
     print("📊 SUMMARY")
     print("=" * 70)
-    print(f"""
-┌─────────────────┬─────────────────────┬─────────────────────┐
-│                 │      HANDOFF        │    AGENT-AS-TOOL    │
-├─────────────────┼─────────────────────┼─────────────────────┤
-│ Control         │ Transfers to        │ Stays with          │
-│                 │ specialist          │ coordinator         │
-├─────────────────┼─────────────────────┼─────────────────────┤
-│ Final Agent     │ {result1.last_agent.name:<19} │ {result2.last_agent.name:<19} │
-├─────────────────┼─────────────────────┼─────────────────────┤
-│ Use When        │ Specialist should   │ Need to combine     │
-│                 │ handle entirely     │ multiple sources    │
-├─────────────────┼─────────────────────┼─────────────────────┤
-│ Code            │ handoffs=[agent]    │ tools=[agent.as_tool()]│
-└─────────────────┴─────────────────────┴─────────────────────┘
-    """)
+    print(_SUMMARY_TEMPLATE.format(
+        agent1=result1.last_agent.name,
+        agent2=result2.last_agent.name,
+    ))
 
 
 if __name__ == "__main__":
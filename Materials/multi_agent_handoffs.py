@@ -12,8 +12,18 @@ Run: python multi_agent_handoffs.py
 """
 
 import asyncio
+import hashlib
+import json
 import os
-from openai import AsyncOpenAI
+import random
+import re
+import shelve
+import sys
+from types import SimpleNamespace
+
+import httpx
+from typing import Optional
+from openai import AsyncOpenAI, RateLimitError
 from agents import Agent, Runner, RunConfig, OpenAIChatCompletionsModel
 
 # ============================================
@@ -25,16 +35,22 @@ if not GEMINI_API_KEY:
     print("❌ Set GEMINI_API_KEY first!")
     exit(1)
 
+# Keepalive pool sized for the gather() fan-outs below, so concurrent
+# requests reuse TCP/TLS sockets instead of handshaking per call
 client = AsyncOpenAI(
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
     api_key=GEMINI_API_KEY,
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    ),
 )
 
-def create_model():
-    return OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=client,
-    )
+# One model wrapper shared by every agent - it is stateless per
+# (model name, client) pair
+MODEL = OpenAIChatCompletionsModel(
+    model="gemini-2.0-flash",
+    openai_client=client,
+)
 
 
 # ============================================
@@ -48,7 +64,7 @@ spanish_agent = Agent(
 - ALWAYS respond in Spanish only
 - Be helpful and friendly
 - You handle all queries in Spanish""",
-    model=create_model(),
+    model=MODEL,
     # No handoffs - this is a leaf agent
 )
 
@@ -59,7 +75,7 @@ tech_agent = Agent(
 - Help with coding, debugging, technical issues
 - Be precise and provide code examples when needed
 - You handle all technical queries""",
-    model=create_model(),
+    model=MODEL,
 )
 
 # Agent for Sales inquiries
@@ -69,7 +85,7 @@ sales_agent = Agent(
 - Help with pricing, plans, and purchases
 - Be persuasive but honest
 - You handle all sales-related queries""",
-    model=create_model(),
+    model=MODEL,
 )
 
 
@@ -87,30 +103,268 @@ triage_agent = Agent(
 4. For general questions, answer yourself briefly.
 
 Always handoff to specialists for their domain - don't try to handle everything yourself.""",
-    model=create_model(),
+    model=MODEL,
     handoffs=[spanish_agent, tech_agent, sales_agent],  # <-- Agents it can handoff to
 )
 
 
+# ============================================
+# RESPONSE CACHE
+# ============================================
+
+# Cap in-flight LLM calls so gather() bursts don't trip the free-tier RPM
+# limit, and retry 429s with jittered exponential backoff
+_LLM_SEM = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+
+
+async def _limited_run(agent: Agent, query: str):
+    delay = 1.0
+    for attempt in range(6):
+        try:
+            async with _LLM_SEM:
+                return await Runner.run(
+                    agent,
+                    query,
+                    run_config=RunConfig(tracing_disabled=True),
+                )
+        except RateLimitError:
+            if attempt == 5:
+                raise
+            await asyncio.sleep(delay + random.random())
+            delay = min(delay * 2, 30.0)
+
+
+_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".llm_cache")
+
+
+async def cached_run(agent: Agent, query: str):
+    """Runner.run behind an on-disk response cache.
+
+    The demo queries repeat verbatim across runs, so a cache hit skips the
+    whole Gemini round-trip. Keyed on agent name + instructions + query,
+    so editing an agent's prompt invalidates its entries.
+    """
+    key = hashlib.sha256(
+        f"{agent.name}\x00{agent.instructions}\x00{query}".encode()
+    ).hexdigest()
+
+    with shelve.open(_CACHE_PATH) as db:
+        hit = db.get(key)
+    if hit is not None:
+        return SimpleNamespace(
+            final_output=hit["final_output"],
+            last_agent=SimpleNamespace(name=hit["agent"]),
+        )
+
+    result = await _limited_run(agent, query)
+    with shelve.open(_CACHE_PATH) as db:
+        db[key] = {
+            "final_output": result.final_output,
+            "agent": result.last_agent.name,
+        }
+    return result
+
+
+def _emit(event) -> None:
+    """Print one streamed token delta, if the event carries one"""
+    if event.type == "raw_response_event" and hasattr(event.data, "delta"):
+        sys.stdout.write(event.data.delta)
+        sys.stdout.flush()
+
+
+async def stream_run(agent: Agent, query: str, hedges: int = 1):
+    """Run an agent and print tokens as they arrive.
+
+    Waiting for final_output means perceived latency equals full
+    generation time; streaming shows the first token as soon as Gemini
+    emits it. Used on interactive paths where a human is watching -
+    batch demos keep cached_run because their results print in order
+    after a fan-out anyway.
+
+    With hedges > 1, that many identical runs start concurrently and the
+    output streams from whichever yields its first event soonest; the
+    rest are cancelled. This trades duplicate token spend for tail
+    latency, so only the interactive loops ask for it.
+    """
+    streams = [
+        Runner.run_streamed(
+            agent,
+            query,
+            run_config=RunConfig(tracing_disabled=True),
+        )
+        for _ in range(hedges)
+    ]
+    iterators = [stream.stream_events().__aiter__() for stream in streams]
+    first = [asyncio.create_task(anext(it)) for it in iterators]
+    done, _ = await asyncio.wait(first, return_when=asyncio.FIRST_COMPLETED)
+    winner = next(i for i, task in enumerate(first) if task in done)
+    
+    for i, stream in enumerate(streams):
+        if i != winner:
+            first[i].cancel()
+            stream.cancel()
+    
+    try:
+        _emit(first[winner].result())
+        async for event in iterators[winner]:
+            _emit(event)
+    except StopAsyncIteration:
+        pass
+    print()
+    return streams[winner]
+
+
 # ============================================
 # RUN EXAMPLES
 # ============================================
 
-async def test_handoff(query: str):
-    """Test a single handoff scenario"""
-    print(f"\n{'='*60}")
-    print(f"👤 User: {query}")
-    print("-" * 60)
+async def test_handoff(query: str) -> dict:
+    """Test a single handoff scenario (returns the result for printing)"""
+    result = await cached_run(fast_route(query) or triage_agent, query)
     
-    result = await Runner.run(
-        triage_agent,
-        query,
-        run_config=RunConfig(tracing_disabled=True),
-    )
+    return {
+        "query": query,
+        "agent": result.last_agent.name,
+        "output": result.final_output,
+    }
+
+
+_SPECIALISTS = {
+    "SpanishAgent": spanish_agent,
+    "TechSupportAgent": tech_agent,
+    "SalesAgent": sales_agent,
+}
+
+# First-stage router: most intents are keyword-separable, and a pattern
+# scan is free next to a triage round-trip. All route keywords compile
+# into ONE alternation with a named group per route, so a query is walked
+# a single time instead of once per route - the stdlib's stand-in for a
+# multi-pattern automaton.
+_SPANISH_HINTS = ("hola", "gracias", "ayuda", "necesito", "¿", "¡", "cómo")
+_TECH_KEYWORDS = (
+    "code", "bug", "exception", "error", "python", "debug", "crash", "traceback",
+)
+_SALES_KEYWORDS = (
+    "price", "pricing", "plan", "plans", "buy", "cost", "subscription", "upgrade",
+)
+
+
+def _alternation(keywords, whole_words: bool) -> str:
+    # Longest-first so "pricing" wins over "price" at the same position
+    body = "|".join(re.escape(kw) for kw in sorted(keywords, key=len, reverse=True))
+    return rf"\b(?:{body})\b" if whole_words else f"(?:{body})"
+
+
+# Spanish hints match as substrings (¿, ¡ are punctuation); English
+# keywords need word boundaries so "plan" doesn't fire inside "explanation"
+_ROUTE_PATTERN = re.compile(
+    "|".join((
+        f"(?P<spanish>{_alternation(_SPANISH_HINTS, whole_words=False)})",
+        f"(?P<tech>{_alternation(_TECH_KEYWORDS, whole_words=True)})",
+        f"(?P<sales>{_alternation(_SALES_KEYWORDS, whole_words=True)})",
+    ))
+)
+
+
+def fast_route(query: str) -> Optional[Agent]:
+    """Keyword pre-router; returns None when the intent is ambiguous."""
+    match = _ROUTE_PATTERN.search(query.lower())
+    if match is None:
+        return None
+    return {
+        "spanish": spanish_agent,
+        "tech": tech_agent,
+        "sales": sales_agent,
+    }[match.lastgroup]
+
+
+def _dedup(queries: list) -> tuple:
+    """Collapse repeated queries before they cost LLM calls.
+
+    Returns the unique queries plus, for each original position, the
+    index of its unique representative - enough to rebuild the full
+    result list afterwards. Matching is whitespace/case-insensitive.
+    """
+    seen: dict = {}
+    unique: list = []
+    index: list = []
+    for query in queries:
+        key = query.strip().lower()
+        pos = seen.get(key)
+        if pos is None:
+            pos = seen[key] = len(unique)
+            unique.append(query)
+        index.append(pos)
+    return unique, index
+
+
+async def batched_triage(queries: list) -> list:
+    """Route a whole batch of queries with ONE triage request.
+
+    Every query shares the same triage system prompt; sending them
+    together pays those input tokens once and counts as a single request
+    against the Gemini rate limit. The chosen specialists then run
+    concurrently.
+    """
+    # Duplicates ride along with their first occurrence - triage and
+    # specialists only ever see unique queries
+    original = queries
+    queries, index = _dedup(queries)
+
+    # Keyword-route what we can for free; only ambiguous queries go to
+    # the batched LLM triage
+    names: list = [
+        agent.name if (agent := fast_route(query)) else None
+        for query in queries
+    ]
+    pending = [i for i, name in enumerate(names) if name is None]
     
-    # Show which agent responded
-    print(f"🤖 Responded by: {result.last_agent.name}")
-    print(f"💬 Response: {result.final_output}")
+    if pending:
+        response = await client.chat.completions.create(
+            model="gemini-2.0-flash",
+            messages=[
+                {
+                    "role": "system",
+                    "content": (
+                        "You are a routing agent. For each query in the JSON "
+                        "array, pick one agent:\n"
+                        "- SpanishAgent: query is in Spanish or asks for Spanish\n"
+                        "- TechSupportAgent: code, bugs, technical issues\n"
+                        "- SalesAgent: pricing, buying, plans\n"
+                        "- TriageAgent: general questions\n"
+                        "Return ONLY a JSON array of agent names, one per "
+                        "query, same order. No other text."
+                    ),
+                },
+                {"role": "user", "content": json.dumps([queries[i] for i in pending])},
+            ],
+        )
+        
+        text = response.choices[0].message.content.strip()
+        # Tolerate a code fence around the array
+        picked = json.loads(text[text.find("["):text.rfind("]") + 1])
+        if len(picked) != len(pending):
+            raise ValueError("triage batch returned wrong length")
+        for i, name in zip(pending, picked):
+            names[i] = name
+    
+    # Dispatch each query to its specialist (or the triage agent itself
+    # for general questions) - all at once
+    results = await asyncio.gather(
+        *(
+            cached_run(_SPECIALISTS.get(name, triage_agent), query)
+            for name, query in zip(names, queries)
+        )
+    )
+    # Fan results back out to the original positions, duplicates included
+    return [
+        {
+            "query": query,
+            "agent": names[index[i]],
+            "output": results[index[i]].final_output,
+        }
+        for i, query in enumerate(original)
+    ]
 
 
 async def main():
@@ -139,9 +393,20 @@ How it works:
         "What time is it?",
     ]
     
-    for query in test_cases:
-        await test_handoff(query)
-        await asyncio.sleep(1)  # Small delay between requests
+    # One batched triage request classifies all four queries, then the
+    # specialists run concurrently; results print in the original order
+    try:
+        results = await batched_triage(test_cases)
+    except Exception:
+        # Malformed batch output - fall back to per-query handoffs
+        results = await asyncio.gather(*(test_handoff(q) for q in test_cases))
+    
+    for res in results:
+        print(f"\n{'='*60}")
+        print(f"👤 User: {res['query']}")
+        print("-" * 60)
+        print(f"🤖 Responded by: {res['agent']}")
+        print(f"💬 Response: {res['output']}")
     
     print(f"\n{'='*60}")
     print("✅ Demo complete!")
@@ -169,14 +434,11 @@ async def interactive():
             if not query:
                 continue
             
-            result = await Runner.run(
-                triage_agent,
-                query,
-                run_config=RunConfig(tracing_disabled=True),
+            print("🤖 Response: ", end="", flush=True)
+            result = await stream_run(
+                fast_route(query) or triage_agent, query, hedges=2
             )
-            
-            print(f"🏷️  Handled by: {result.last_agent.name}")
-            print(f"🤖 Response: {result.final_output}\n")
+            print(f"🏷️  Handled by: {result.last_agent.name}\n")
             
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
@@ -12,8 +12,15 @@ Run: python multi_agent_tools.py
 """
 
 import asyncio
+import hashlib
 import os
-from openai import AsyncOpenAI
+import random
+import shelve
+import sys
+from types import SimpleNamespace
+
+import httpx
+from openai import AsyncOpenAI, RateLimitError
 from agents import Agent, Runner, RunConfig, OpenAIChatCompletionsModel
 
 # ============================================
@@ -25,16 +32,22 @@ if not GEMINI_API_KEY:
     print("❌ Set GEMINI_API_KEY first!")
     exit(1)
 
+# Keepalive pool sized for the gather() fan-outs below, so concurrent
+# requests reuse TCP/TLS sockets instead of handshaking per call
 client = AsyncOpenAI(
     base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
     api_key=GEMINI_API_KEY,
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+    ),
 )
 
-def create_model():
-    return OpenAIChatCompletionsModel(
-        model="gemini-2.0-flash",
-        openai_client=client,
-    )
+# One model wrapper shared by every agent - it is stateless per
+# (model name, client) pair
+MODEL = OpenAIChatCompletionsModel(
+    model="gemini-2.0-flash",
+    openai_client=client,
+)
 
 
 # ============================================
@@ -48,7 +61,7 @@ research_agent = Agent(
 - Provide factual, well-researched information
 - Be concise but comprehensive
 - Focus on accuracy""",
-    model=create_model(),
+    model=MODEL,
 )
 
 # Writer Agent - writes content
@@ -58,7 +71,7 @@ writer_agent = Agent(
 - Write engaging, well-structured content
 - Use clear and compelling language
 - Adapt tone to the request""",
-    model=create_model(),
+    model=MODEL,
 )
 
 # Critic Agent - reviews and improves
@@ -68,7 +81,7 @@ critic_agent = Agent(
 - Review content for quality and accuracy
 - Suggest specific improvements
 - Be helpful, not harsh""",
-    model=create_model(),
+    model=MODEL,
 )
 
 
@@ -76,6 +89,22 @@ critic_agent = Agent(
 # COORDINATOR AGENT (Uses others as tools)
 # ============================================
 
+# as_tool() builds a closure and a JSON schema via introspection each
+# call - bind every wrapped specialist exactly once at module top and
+# hand the same tool objects to whichever coordinator needs them
+_RESEARCH_TOOL = research_agent.as_tool(
+    tool_name="research_expert",
+    tool_description="Research specialist. Use for gathering facts, data, and information on any topic.",
+)
+_WRITER_TOOL = writer_agent.as_tool(
+    tool_name="writing_expert",
+    tool_description="Writing specialist. Use for creating articles, summaries, or any written content.",
+)
+_CRITIC_TOOL = critic_agent.as_tool(
+    tool_name="review_expert",
+    tool_description="Review specialist. Use for critiquing and improving content quality.",
+)
+
 coordinator_agent = Agent(
     name="CoordinatorAgent",
     instructions="""You are a project coordinator that manages a team of specialists.
@@ -92,22 +121,8 @@ For complex tasks:
 
 Compile all inputs into a polished final response.
 Always coordinate - don't do specialist work yourself.""",
-    model=create_model(),
-    tools=[
-        # Convert agents to tools!
-        research_agent.as_tool(
-            tool_name="research_expert",
-            tool_description="Research specialist. Use for gathering facts, data, and information on any topic.",
-        ),
-        writer_agent.as_tool(
-            tool_name="writing_expert", 
-            tool_description="Writing specialist. Use for creating articles, summaries, or any written content.",
-        ),
-        critic_agent.as_tool(
-            tool_name="review_expert",
-            tool_description="Review specialist. Use for critiquing and improving content quality.",
-        ),
-    ],
+    model=MODEL,
+    tools=[_RESEARCH_TOOL, _WRITER_TOOL, _CRITIC_TOOL],
 )
 
 
@@ -118,19 +133,32 @@ Always coordinate - don't do specialist work yourself.""",
 spanish_translator = Agent(
     name="SpanishTranslator",
     instructions="You translate text to Spanish. Return ONLY the translation, nothing else.",
-    model=create_model(),
+    model=MODEL,
 )
 
 french_translator = Agent(
     name="FrenchTranslator", 
     instructions="You translate text to French. Return ONLY the translation, nothing else.",
-    model=create_model(),
+    model=MODEL,
 )
 
 german_translator = Agent(
     name="GermanTranslator",
     instructions="You translate text to German. Return ONLY the translation, nothing else.",
-    model=create_model(),
+    model=MODEL,
+)
+
+_SPANISH_TOOL = spanish_translator.as_tool(
+    tool_name="spanish_translator",
+    tool_description="Translates text to Spanish",
+)
+_FRENCH_TOOL = french_translator.as_tool(
+    tool_name="french_translator",
+    tool_description="Translates text to French",
+)
+_GERMAN_TOOL = german_translator.as_tool(
+    tool_name="german_translator",
+    tool_description="Translates text to German",
 )
 
 translation_coordinator = Agent(
@@ -143,48 +171,156 @@ When user asks to translate something:
 3. Present results clearly
 
 Available tools: spanish_translator, french_translator, german_translator""",
-    model=create_model(),
-    tools=[
-        spanish_translator.as_tool(
-            tool_name="spanish_translator",
-            tool_description="Translates text to Spanish",
-        ),
-        french_translator.as_tool(
-            tool_name="french_translator",
-            tool_description="Translates text to French",
-        ),
-        german_translator.as_tool(
-            tool_name="german_translator",
-            tool_description="Translates text to German",
-        ),
-    ],
+    model=MODEL,
+    tools=[_SPANISH_TOOL, _FRENCH_TOOL, _GERMAN_TOOL],
 )
 
 
+# ============================================
+# RESPONSE CACHE
+# ============================================
+
+# Cap in-flight LLM calls so gather() bursts don't trip the free-tier RPM
+# limit, and retry 429s with jittered exponential backoff
+_LLM_SEM = asyncio.Semaphore(int(os.getenv("LLM_MAX_CONCURRENCY", "8")))
+
+
+async def _limited_run(agent: Agent, query: str):
+    delay = 1.0
+    for attempt in range(6):
+        try:
+            async with _LLM_SEM:
+                return await Runner.run(
+                    agent,
+                    query,
+                    run_config=RunConfig(tracing_disabled=True),
+                )
+        except RateLimitError:
+            if attempt == 5:
+                raise
+            await asyncio.sleep(delay + random.random())
+            delay = min(delay * 2, 30.0)
+
+
+_CACHE_PATH = os.path.join(os.path.dirname(__file__), ".llm_cache")
+
+
+async def cached_run(agent: Agent, query: str):
+    """Runner.run behind an on-disk response cache.
+
+    The demo queries repeat verbatim across runs, so a cache hit skips the
+    whole Gemini round-trip. Keyed on agent name + instructions + query,
+    so editing an agent's prompt invalidates its entries.
+    """
+    key = hashlib.sha256(
+        f"{agent.name}\x00{agent.instructions}\x00{query}".encode()
+    ).hexdigest()
+
+    with shelve.open(_CACHE_PATH) as db:
+        hit = db.get(key)
+    if hit is not None:
+        return SimpleNamespace(
+            final_output=hit["final_output"],
+            last_agent=SimpleNamespace(name=hit["agent"]),
+        )
+
+    result = await _limited_run(agent, query)
+    with shelve.open(_CACHE_PATH) as db:
+        db[key] = {
+            "final_output": result.final_output,
+            "agent": result.last_agent.name,
+        }
+    return result
+
+
+def _emit(event) -> None:
+    """Print one streamed token delta, if the event carries one"""
+    if event.type == "raw_response_event" and hasattr(event.data, "delta"):
+        sys.stdout.write(event.data.delta)
+        sys.stdout.flush()
+
+
+async def stream_run(agent: Agent, query: str, hedges: int = 1):
+    """Run an agent and print tokens as they arrive.
+
+    Waiting for final_output means perceived latency equals full
+    generation time; streaming shows the first token as soon as Gemini
+    emits it. Used on interactive paths where a human is watching -
+    batch demos keep cached_run because their results print in order
+    after a fan-out anyway.
+
+    With hedges > 1, that many identical runs start concurrently and the
+    output streams from whichever yields its first event soonest; the
+    rest are cancelled. This trades duplicate token spend for tail
+    latency, so only the interactive loops ask for it.
+    """
+    streams = [
+        Runner.run_streamed(
+            agent,
+            query,
+            run_config=RunConfig(tracing_disabled=True),
+        )
+        for _ in range(hedges)
+    ]
+    iterators = [stream.stream_events().__aiter__() for stream in streams]
+    first = [asyncio.create_task(anext(it)) for it in iterators]
+    done, _ = await asyncio.wait(first, return_when=asyncio.FIRST_COMPLETED)
+    winner = next(i for i, task in enumerate(first) if task in done)
+    
+    for i, stream in enumerate(streams):
+        if i != winner:
+            first[i].cancel()
+            stream.cancel()
+    
+    try:
+        _emit(first[winner].result())
+        async for event in iterators[winner]:
+            _emit(event)
+    except StopAsyncIteration:
+        pass
+    print()
+    return streams[winner]
+
+
 # ============================================
 # RUN EXAMPLES
 # ============================================
 
+async def translate_all(text: str) -> dict[str, str]:
+    """Deterministic fan-out to all three translators at once.
+    
+    Routing here isn't a decision - it's always all three languages - so
+    there is no reason to pay an extra LLM round-trip for a coordinator to
+    call the tools one by one. The three calls are independent and run
+    concurrently: latency is max(one translation), not the sum.
+    """
+    spanish, french, german = await asyncio.gather(
+        cached_run(spanish_translator, text),
+        cached_run(french_translator, text),
+        cached_run(german_translator, text),
+    )
+    return {
+        "Spanish": spanish.final_output,
+        "French": french.final_output,
+        "German": german.final_output,
+    }
+
+
 async def demo_translation():
-    """Demo: Translation coordinator"""
+    """Demo: Parallel translation fan-out"""
     print("\n" + "=" * 60)
-    print("📝 DEMO 1: Translation Coordinator")
+    print("📝 DEMO 1: Translation Fan-Out")
     print("=" * 60)
     
-    query = "Translate 'Hello, how are you?' to Spanish, French, and German"
-    print(f"\n👤 User: {query}\n")
-    print("🔄 Coordinator calling translator agents...")
-    
-    result = await Runner.run(
-        translation_coordinator,
-        query,
-        run_config=RunConfig(tracing_disabled=True),
-    )
+    text = "Hello, how are you?"
+    print(f"\n👤 User: Translate '{text}' to Spanish, French, and German\n")
+    print("🔄 Calling all three translators concurrently...")
     
-    print(f"\n🤖 Final Response:\n{result.final_output}")
+    translations = await translate_all(text)
     
-    # Show that coordinator stayed in control
-    print(f"\n📊 Handled by: {result.last_agent.name}")
+    print("\n🤖 Translations:")
+    for language, translation in translations.items():
+        print(f"   {language}: {translation}")
 
 
 async def demo_content_creation():
@@ -197,11 +333,7 @@ async def demo_content_creation():
     print(f"\n👤 User: {query}\n")
     print("🔄 Coordinator orchestrating: Research → Write → Review...")
     
-    result = await Runner.run(
-        coordinator_agent,
-        query,
-        run_config=RunConfig(tracing_disabled=True),
-    )
+    result = await cached_run(coordinator_agent, query)
     
     print(f"\n🤖 Final Response:\n{result.final_output}")
     print(f"\n📊 Handled by: {result.last_agent.name}")
@@ -263,14 +395,9 @@ async def interactive():
             if not query:
                 continue
             
-            print("🔄 Processing...")
-            result = await Runner.run(
-                agent,
-                query,
-                run_config=RunConfig(tracing_disabled=True),
-            )
-            
-            print(f"\n🤖 Response:\n{result.final_output}\n")
+            print("\n🤖 Response:")
+            await stream_run(agent, query, hedges=2)
+            print()
             
         except KeyboardInterrupt:
             print("\n👋 Goodbye!")
@@ -6,16 +6,47 @@ Run: python my_server.py
 from fastmcp import FastMCP
 from typing import Annotated
 from pydantic import Field
+from collections import Counter
 import json
 
+# Compact separators: the output is consumed by a model, and skipping the
+# pretty-printer both speeds up dumps and trims response tokens
+def _dumps(obj) -> str:
+    return json.dumps(obj, separators=(",", ":"))
+
 # Initialize the MCP server
 mcp = FastMCP("TaskManager")
 
-# In-memory database
+# In-memory database, columnar (structure-of-arrays) layout: aggregations
+# scan one contiguous list instead of pointer-chasing per-task dicts
 tasks_db = {
-    "1": {"id": "1", "title": "Learn FastMCP", "status": "in_progress", "priority": "high"},
-    "2": {"id": "2", "title": "Build Agent", "status": "pending", "priority": "medium"},
+    "id": ["1", "2"],
+    "title": ["Learn FastMCP", "Build Agent"],
+    "status": ["in_progress", "pending"],
+    "priority": ["high", "medium"],
 }
+_id_index = {"1": 0, "2": 1}  # id -> row position
+_next_id = 3
+
+# Snapshot cache for the read-heavy get_all_tasks path: writers bump
+# _version, readers reserialize only when the version moved
+_version = 0
+_all_tasks_cache = (-1, "")  # (version serialized at, payload)
+
+
+def _bump_version() -> None:
+    global _version
+    _version += 1
+
+
+def _row(i: int) -> dict:
+    """Materialize one task row from the columns"""
+    return {
+        "id": tasks_db["id"][i],
+        "title": tasks_db["title"][i],
+        "status": tasks_db["status"][i],
+        "priority": tasks_db["priority"][i],
+    }
 
 # ============================================
 # TOOLS - Actions the AI can perform
@@ -24,7 +55,12 @@ tasks_db = {
 @mcp.tool
 def get_all_tasks() -> str:
     """Get all tasks from the database"""
-    return json.dumps(list(tasks_db.values()), indent=2)
+    global _all_tasks_cache
+    version, payload = _all_tasks_cache
+    if version != _version:
+        payload = _dumps([_row(i) for i in range(len(tasks_db["id"]))])
+        _all_tasks_cache = (_version, payload)
+    return payload
 
 
 @mcp.tool
@@ -32,9 +68,10 @@ def get_task(
     task_id: Annotated[str, Field(description="The unique ID of the task")]
 ) -> str:
     """Get a specific task by ID"""
-    if task_id in tasks_db:
-        return json.dumps(tasks_db[task_id], indent=2)
-    return json.dumps({"error": f"Task {task_id} not found"})
+    i = _id_index.get(task_id)
+    if i is not None:
+        return _dumps(_row(i))
+    return _dumps({"error": f"Task {task_id} not found"})
 
 
 @mcp.tool
@@ -43,15 +80,18 @@ def create_task(
     priority: Annotated[str, Field(description="Priority: low, medium, or high")] = "medium"
 ) -> str:
     """Create a new task"""
-    new_id = str(len(tasks_db) + 1)
-    new_task = {
-        "id": new_id,
-        "title": title,
-        "status": "pending",
-        "priority": priority
-    }
-    tasks_db[new_id] = new_task
-    return json.dumps({"success": True, "task": new_task})
+    global _next_id
+    new_id = str(_next_id)
+    _next_id += 1
+    
+    _id_index[new_id] = len(tasks_db["id"])
+    tasks_db["id"].append(new_id)
+    tasks_db["title"].append(title)
+    tasks_db["status"].append("pending")
+    tasks_db["priority"].append(priority)
+    _bump_version()
+    
+    return _dumps({"success": True, "task": _row(_id_index[new_id])})
 
 
 @mcp.tool
@@ -60,10 +100,12 @@ def update_task_status(
     status: Annotated[str, Field(description="New status: pending, in_progress, or completed")]
 ) -> str:
     """Update the status of a task"""
-    if task_id in tasks_db:
-        tasks_db[task_id]["status"] = status
-        return json.dumps({"success": True, "task": tasks_db[task_id]})
-    return json.dumps({"error": f"Task {task_id} not found"})
+    i = _id_index.get(task_id)
+    if i is not None:
+        tasks_db["status"][i] = status
+        _bump_version()
+        return _dumps({"success": True, "task": _row(i)})
+    return _dumps({"error": f"Task {task_id} not found"})
 
 
 @mcp.tool
@@ -71,10 +113,20 @@ def delete_task(
     task_id: Annotated[str, Field(description="The task ID to delete")]
 ) -> str:
     """Delete a task by ID"""
-    if task_id in tasks_db:
-        deleted = tasks_db.pop(task_id)
-        return json.dumps({"success": True, "deleted": deleted})
-    return json.dumps({"error": f"Task {task_id} not found"})
+    i = _id_index.pop(task_id, None)
+    if i is None:
+        return _dumps({"error": f"Task {task_id} not found"})
+    
+    deleted = _row(i)
+    # Swap-with-last keeps deletion O(1) on every column
+    last = len(tasks_db["id"]) - 1
+    for column in tasks_db.values():
+        column[i] = column[last]
+        column.pop()
+    if i != last:
+        _id_index[tasks_db["id"][i]] = i
+    _bump_version()
+    return _dumps({"success": True, "deleted": deleted})
 
 
 # ============================================
@@ -84,29 +136,21 @@ def delete_task(
 @mcp.resource("tasks://summary")
 def get_tasks_summary() -> str:
     """Get a summary of all tasks"""
-    total = len(tasks_db)
-    by_status = {}
-    by_priority = {}
-    
-    for task in tasks_db.values():
-        status = task["status"]
-        priority = task["priority"]
-        by_status[status] = by_status.get(status, 0) + 1
-        by_priority[priority] = by_priority.get(priority, 0) + 1
-    
-    return json.dumps({
-        "total_tasks": total,
-        "by_status": by_status,
-        "by_priority": by_priority
-    }, indent=2)
+    # Counter over a contiguous column runs the tally loop in C
+    return _dumps({
+        "total_tasks": len(tasks_db["id"]),
+        "by_status": dict(Counter(tasks_db["status"])),
+        "by_priority": dict(Counter(tasks_db["priority"])),
+    })
 
 
 @mcp.resource("tasks://{task_id}")
 def get_task_resource(task_id: str) -> str:
     """Get task details as a resource"""
-    if task_id in tasks_db:
-        return json.dumps(tasks_db[task_id], indent=2)
-    return json.dumps({"error": f"Task {task_id} not found"})
+    i = _id_index.get(task_id)
+    if i is not None:
+        return _dumps(_row(i))
+    return _dumps({"error": f"Task {task_id} not found"})
 
 
 # ============================================
@@ -0,0 +1,53 @@
+"""Shared AsyncOpenAI client for the local Ollama backend.
+
+Every script in this folder was building its own AsyncOpenAI instance,
+each dragging along a private httpx connection pool. Importing this one
+singleton means all Runner.run calls in a process reuse the same warm
+keep-alive sockets instead of handshaking per file.
+"""
+
+import asyncio
+import os
+
+import httpx
+from openai import AsyncOpenAI
+from agents import OpenAIChatCompletionsModel
+from dotenv import load_dotenv
+
+load_dotenv()
+
+OLLAMA_CLIENT = AsyncOpenAI(
+    api_key=os.getenv("OLLAMA_API_KEY"),
+    base_url="http://127.0.0.1:11434/v1",
+    # 127.0.0.1 skips the localhost getaddrinfo dance (some stacks try
+    # IPv6 ::1 first and eat a failing lookup per new connection). HTTP/2
+    # multiplexing would need the optional h2 extra and a reverse proxy
+    # in front of Ollama, so it stays off here.
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_connections=100, max_keepalive_connections=50),
+        timeout=60,
+        # Connect-level retries absorb the transient resets Ollama throws
+        # when its worker pool is saturated
+        transport=httpx.AsyncHTTPTransport(retries=3),
+    ),
+)
+
+
+# Ollama serves a small fixed worker pool; unbounded gather fan-outs past
+# it produce TCP resets rather than queueing. All model traffic funnels
+# through this semaphore so parallel runs overlap up to the backend's
+# capacity and wait their turn beyond it.
+OLLAMA_SEM = asyncio.Semaphore(int(os.getenv("OLLAMA_MAX_CONCURRENCY", "8")))
+
+
+class ThrottledChatModel(OpenAIChatCompletionsModel):
+    """OpenAIChatCompletionsModel whose calls are bounded by OLLAMA_SEM"""
+
+    async def get_response(self, *args, **kwargs):
+        async with OLLAMA_SEM:
+            return await super().get_response(*args, **kwargs)
+
+    async def stream_response(self, *args, **kwargs):
+        async with OLLAMA_SEM:
+            async for chunk in super().stream_response(*args, **kwargs):
+                yield chunk
@@ -1,19 +1,40 @@
-from agents import Agent, Runner, RunConfig, OpenAIChatCompletionsModel
+from agents import Agent, Runner, RunConfig, OpenAIChatCompletionsModel, function_tool
 from openai import AsyncOpenAI
 from dotenv import load_dotenv
+from typing import Final
+import functools
 import os 
 import asyncio
 
+import httpx
+
 
 load_dotenv()
 
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
+# One client for the whole file; the keepalive pool is sized for the
+# translator/research gather() fan-outs so concurrent calls reuse warm
+# sockets instead of handshaking per request
 client = AsyncOpenAI(
     api_key= os.getenv("OLLAMA_API_KEY"),
-    base_url = "http://localhost:11434/v1"
+    base_url = "http://127.0.0.1:11434/v1",
+    http_client=httpx.AsyncClient(
+        limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+    ),
 )
 
 
+@functools.lru_cache(maxsize=1)
 def create_ollama_model():
+    # Stateless per (model, client) pair - every agent in this file can
+    # share the one instance instead of re-reading env vars per call
     return OpenAIChatCompletionsModel(
         model=os.getenv("OLLAMA_MODEL_NAME"),
         openai_client=client
@@ -53,29 +74,57 @@ critic_agent = Agent(
 ## Main Agent 
 ## Coordinator Main Agent
 
-project_coordinator_agent = Agent(
-    name="ProjectCoordinatorAgent",
-    instructions="""You are a project coordinator that manages a team of specialists.
+@function_tool
+async def research_topic(topic: str) -> str:
+    """Research a topic from several angles at once"""
+    # The research phase has no internal ordering: expand the topic into
+    # fixed sub-questions (a template, no LLM planning call) and run the
+    # research agent on all of them concurrently. Writing and review keep
+    # their order - each one consumes the previous step's output.
+    sub_questions = [
+        f"Give the key facts and background on: {topic}",
+        f"What are the main challenges or open problems in: {topic}?",
+        f"What are current best practices or recommended next steps for: {topic}?",
+    ]
+    config = RunConfig(tracing_disabled=True)
+    results = await asyncio.gather(
+        *(Runner.run(research_agent, q, run_config=config) for q in sub_questions),
+        return_exceptions=True,
+    )
+    sections = []
+    for question, result in zip(sub_questions, results):
+        body = f"research failed: {result}" if isinstance(result, Exception) else result.final_output
+        sections.append(f"## {question}\n{body}")
+    return "\n\n".join(sections)
+
+
+# Instructions live in module constants so every turn sends the exact
+# same bytes: Ollama's prefix cache keys on the token prefix, and one
+# changed byte (e.g. an interpolated datetime.now()) would force a full
+# prompt recompute on every turn
+_COORDINATOR_INSTRUCTIONS: Final[str] = """You are a project coordinator that manages a team of specialists.
 
 Your team (available as tools):
-1. research_expert - Use for gathering facts and information
+1. research_topic - Researches a topic from several angles in one call
 2. writing_expert - Use for creating written content
 3. review_expert - Use for reviewing and improving content
 
 For complex tasks:
-1. First, use research_expert to gather information
+1. First, call research_topic ONCE to gather information
 2. Then, use writing_expert to create content
 3. Finally, use review_expert to get feedback
 
 Compile all inputs into a polished final response.
-Always coordinate - don't do specialist work yourself.""",
+Always coordinate - don't do specialist work yourself."""
+
+
+project_coordinator_agent = Agent(
+    name="ProjectCoordinatorAgent",
+    instructions=_COORDINATOR_INSTRUCTIONS,
     model=create_ollama_model(),
     tools=[
+        research_topic,
         # Convert agents to tools!
-        research_agent.as_tool(
-            tool_name="research_expert",
-            tool_description="Research specialist. Use for gathering facts, data, and information on any topic.",
-        ),
         writer_agent.as_tool(
             tool_name="writing_expert", 
             tool_description="Writing specialist. Use for creating articles, summaries, or any written content.",
@@ -108,31 +157,40 @@ german_translator = Agent(
     model=create_ollama_model(),
 )
 
-translation_coordinator = Agent(
-    name="TranslationCoordinator",
-    instructions="""You coordinate translations to multiple languages.
+@function_tool
+async def translate_all(text: str) -> dict:
+    """Translate text to Spanish, French and German in one call"""
+    # One tool call fans out to all three translators concurrently, so
+    # the coordinator pays max(latency) instead of three sequential tool
+    # round-trips; return_exceptions keeps one failed language from
+    # sinking the other two
+    config = RunConfig(tracing_disabled=True)
+    results = await asyncio.gather(
+        Runner.run(spanish_translator, text, run_config=config),
+        Runner.run(french_translator, text, run_config=config),
+        Runner.run(german_translator, text, run_config=config),
+        return_exceptions=True,
+    )
+    return {
+        lang: f"translation failed: {r}" if isinstance(r, Exception) else r.final_output
+        for lang, r in zip(("es", "fr", "de"), results)
+    }
+
+
+_TRANSLATION_INSTRUCTIONS: Final[str] = """You coordinate translations to multiple languages.
 
 When user asks to translate something:
-1. Use the appropriate translator tools
+1. Call the translate_all tool ONCE with the text - it returns Spanish,
+   French and German together
 2. Compile all translations in a nice format
-3. Present results clearly
+3. Present results clearly"""
+
 
-Available tools: spanish_translator, french_translator, german_translator""",
+translation_coordinator = Agent(
+    name="TranslationCoordinator",
+    instructions=_TRANSLATION_INSTRUCTIONS,
     model=create_ollama_model(),
-    tools=[
-        spanish_translator.as_tool(
-            tool_name="spanish_translator",
-            tool_description="Translates text to Spanish",
-        ),
-        french_translator.as_tool(
-            tool_name="french_translator",
-            tool_description="Translates text to French",
-        ),
-        german_translator.as_tool(
-            tool_name="german_translator",
-            tool_description="Translates text to German",
-        ),
-    ],
+    tools=[translate_all],
 )
 
 
@@ -4,6 +4,14 @@ from agents import Agent, AgentBase, RunContextWrapper, Runner, trace
 from dotenv import load_dotenv
 load_dotenv()
 
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 class AppContext(BaseModel):
     language_preference: str = "spanish_only"
     
@@ -62,11 +70,39 @@ orchestrator = Agent(
 )
 
 
+# Resolved tool lists cached per language preference: the preference is
+# the only input that changes which tools pass is_enabled, so each of the
+# three shapes pays the get_all_tools resolution (is_enabled callbacks,
+# and remote MCP fetches in SDK versions that do them here) exactly once
+_TOOLS_CACHE: dict = {}
+
+
+async def resolved_tools(context: RunContextWrapper) -> list:
+    pref = context.context.language_preference
+    tools = _TOOLS_CACHE.get(pref)
+    if tools is None:
+        tools = _TOOLS_CACHE[pref] = await orchestrator.get_all_tools(run_context=context)
+    return tools
+
+
+async def warm_tools_cache() -> None:
+    """Resolve all three preference shapes up front, concurrently."""
+    prefs = ("spanish_only", "french_spanish", "european")
+    await asyncio.gather(*(
+        resolved_tools(RunContextWrapper(AppContext(language_preference=pref)))
+        for pref in prefs
+    ))
+
+
 async def main():
     """ Interactive demo with llm interaction."""
     
     print("Lets start our demo")
-    
+
+    # The input space is three values, so the whole cache can be warmed
+    # before the user has even picked an option
+    await warm_tools_cache()
+
     print("Choose language preference:")
     print("1. Spanish only (1 tools)")
     print("2. French and spanish (2 tools)")
@@ -79,7 +115,7 @@ async def main():
     
     context = RunContextWrapper(AppContext(language_preference=language_preference))
     
-    available_tools = await orchestrator.get_all_tools(run_context=context)
+    available_tools = await resolved_tools(context)
     
     # print(available_tools)
     
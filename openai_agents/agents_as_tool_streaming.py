@@ -1,4 +1,6 @@
 import asyncio
+import re
+import sys
 from agents import Agent, Runner, Tool, function_schema, function_tool, RunContextWrapper
 from dotenv import load_dotenv
 from openai.types.responses import ResponseTextDeltaEvent, ResponseFunctionCallArgumentsDeltaEvent
@@ -6,36 +8,95 @@ from openai.types.responses import ResponseTextDeltaEvent, ResponseFunctionCallA
 from agents import AgentToolStreamEvent, ModelSettings
 
 load_dotenv()
+
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
  
 
+def _billing_answer(customer_id: str | None, question: str) -> str:
+
+    """ Return a canned billing answer or a fallback when the question is unrelated."""
+
+    normalized = question.lower()
+
+    if "bill" in normalized or "billing" in normalized :
+        return f"This customer (ID: {customer_id}'s bill is $1oo)"
+
+    return "I can only answer questions about billing."
+
+
 @function_tool(
     name_override="billing_status_checker",
     description_override="Answer questions about customer billing status."
                )
 def billing_status_checker(customer_id: str | None = None, question:str= "") -> str:
-    
+
     """ Return a canned billing answer or a fallback when the question is unrelated."""
-    
-    normalized = question.lower()
-    
-    if "bill" in normalized or "billing" in normalized :
-        return f"This customer (ID: {customer_id}'s bill is $1oo)"
-    
-    return "I can only answer questions about billing."
+
+    return _billing_answer(customer_id, question)
+
+
+_BILLING_RE = re.compile(r"\b(?:bill|billing)\b", re.IGNORECASE)
+_CUSTOMER_ID_RE = re.compile(r"\b([A-Z]{2,}\d+)\b")
+
+
+def fast_billing_answer(question: str) -> str | None:
+    """ Answer trivially-billing questions with zero LLM calls.
+
+    The full path is main_agent -> billing_agent -> billing_status_checker:
+    two model round-trips wrapping a substring check. When the question
+    already names billing and carries a customer id, the canned answer is
+    fully determined, so the agent stack adds nothing but latency.
+    Tradeoff: a fast-path hit also skips the nested-streaming machinery
+    this file demonstrates - ask something less obviously billing-shaped
+    to watch the sub-agent stream.
+    """
+    if not _BILLING_RE.search(question):
+        return None
+    customer_id = _CUSTOMER_ID_RE.search(question)
+    if customer_id is None:
+        return None
+    return _billing_answer(customer_id.group(1), question)
+
+
+# handle_stream fires once per token delta; a print() per event formats,
+# writes and flushes every time, which dominates CPU once the sub-agent
+# streams hundreds of deltas. Uninteresting event types are skipped before
+# any formatting, the rest buffer and flush in one write per 64 events.
+_SKIP = frozenset({"agent_updated_stream_event"})
+_BUF: list[str] = []
+_FLUSH_EVERY = 64
 
 
 def handle_stream(event:AgentToolStreamEvent) -> None:
-    """ Print Streaming events emitted by the nested billing agent."""
-    
+    """ Buffer streaming events emitted by the nested billing agent."""
+
     stream = event["event"]
+    if stream.type in _SKIP:
+        return
+
     tool_call = event.get("tool_call")
     tool_call_info = tool_call.call_id if tool_call is not None else "unknow"
-    
-    print(f"[Stream] agent={event["agent"].name} call= {tool_call_info} type = {stream.type} {stream}" )
-    
+    agent_name = event["agent"].name
+
+    _BUF.append(f"[Stream] agent={agent_name} call= {tool_call_info} type = {stream.type} {stream}\n")
+    if len(_BUF) >= _FLUSH_EVERY:
+        flush_stream()
+
+
+def flush_stream() -> None:
+    """ Write out any buffered stream lines in a single syscall."""
+    if _BUF:
+        sys.stdout.write("".join(_BUF))
+        _BUF.clear()
+
+
 
-            
-            
 async def main() -> None:
 
     billing_agent = Agent(
@@ -68,13 +129,39 @@ async def main() -> None:
     # print(f"\nFinal response:\n{result.final_output}")
     
     
-    result = Runner.run_streamed(main_agent, "Hello, my customer ID is ABC123. How much is my bill for this month?",)
-    
-    async for event in result.stream_events():
-        # print(f"Event: {event}")
-        pass
-        
-    print(result.final_output)
+    # Two demo questions so both routes actually run: the first is
+    # trivially billing-shaped (billing keyword + customer id) and lands
+    # on the zero-LLM fast path; the second is still a billing matter
+    # but not canned-answerable, so it walks the full streamed agent
+    # stack and exercises the on_stream hook above.
+    questions = [
+        "Hello, my customer ID is ABC123. How much is my bill for this month?",
+        "Hi, I think I was charged twice last month - can you check what happened?",
+    ]
+
+    for question in questions:
+        print(f"\nQuestion: {question}")
+
+        canned = fast_billing_answer(question)
+        if canned is not None:
+            print(canned)
+            continue
+
+        # Streaming is kept because the nested billing agent's on_stream hook
+        # is the point of this demo; the outer loop only needs the text
+        # deltas, so everything else is dropped on the cheap type check
+        # before touching event.data
+        result = Runner.run_streamed(main_agent, question)
+
+        out: list[str] = []
+        async for event in result.stream_events():
+            if event.type != "raw_response_event":
+                continue
+            if isinstance(event.data, ResponseTextDeltaEvent):
+                out.append(event.data.delta)
+
+        flush_stream()  # drain whatever the last partial buffer holds
+        print("".join(out) if out else result.final_output)
     
     
     # out_stream = Runner.run_streamed(main_agent,
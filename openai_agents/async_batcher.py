@@ -0,0 +1,63 @@
+"""Dynamic micro-batching for async call sites.
+
+When a model emits several tool calls in one response, each call lands on
+the backend separately. An AsyncBatcher collects calls that arrive within
+a short window and hands them to one batch function, resolving each
+caller's future from the batched result - per-call overhead is paid once
+per flush instead of once per call.
+"""
+
+import asyncio
+
+
+class AsyncBatcher:
+    """Queue (args, future) pairs and flush them as a single batch call.
+
+    batch_fn receives a list of args tuples and must return one result
+    per tuple, in order. A flush happens when max_batch calls are waiting
+    or max_wait_ms elapsed since the first queued call, whichever comes
+    first.
+    """
+
+    def __init__(self, batch_fn, max_batch: int = 32, max_wait_ms: int = 10):
+        self._batch_fn = batch_fn
+        self._max_batch = max_batch
+        self._max_wait = max_wait_ms / 1000
+        self._pending = []  # (args, future) in arrival order
+        self._flush_task = None
+
+    async def __call__(self, *args):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((args, future))
+
+        if len(self._pending) >= self._max_batch:
+            self._flush()
+        elif self._flush_task is None:
+            self._flush_task = loop.create_task(self._flush_later())
+
+        return await future
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._max_wait)
+        self._flush()
+
+    def _flush(self):
+        batch, self._pending = self._pending, []
+        timer, self._flush_task = self._flush_task, None
+        if timer is not None and timer is not asyncio.current_task():
+            timer.cancel()
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        try:
+            results = await self._batch_fn([args for args, _ in batch])
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
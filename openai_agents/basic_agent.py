@@ -12,6 +12,14 @@ import sys
 # ## if we want to access gemini by using openai-sdk
 
 # load_dotenv()
+
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
 # from openai import AsyncOpenAI
 # from agents import set_tracing_disabled, RunConfig, set_default_openai_api
 # from agents.models.openai_provider import OpenAIProvider
@@ -59,7 +67,7 @@ import sys
 
 
 # ollama_client = AsyncOpenAI(
-#     base_url = "http://localhost:11434/v1",
+#     base_url = "http://127.0.0.1:11434/v1",
 #     api_key = "OLLAMA"
 # )
 
@@ -149,19 +157,23 @@ from openai import AsyncOpenAI
 load_dotenv()
 
 ollama_client = AsyncOpenAI(
-    base_url = "http://localhost:11434/v1",
+    base_url = "http://127.0.0.1:11434/v1",
     api_key = "OLLAMA"
     )
 
+## build the model wrapper once at module load - it is stateless, so
+## every run (and any future agent here) shares it and the client pool
+ollama_model = OpenAIChatCompletionsModel(
+    openai_client = ollama_client,
+    model = "ministral-3:3b"
+)
+
 
 async def main():
     agent = Agent(
         name = "Assistant",
         instructions = "You are a helpful assistant that answer question clearly and concisely.",
-        model = OpenAIChatCompletionsModel(
-            openai_client = ollama_client,
-            model = "ministral-3:3b"
-        )
+        model = ollama_model
     )
 
     result = await Runner.run(
@@ -5,6 +5,14 @@ import asyncio
 
 load_dotenv()
 
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 
 ## lets define the user context
 class UserContext(BaseModel):
@@ -15,12 +23,16 @@ class UserContext(BaseModel):
 
 
 
-@function_tool
-async def get_user_information(ctx: RunContextWrapper[UserContext]):
+async def _get_user_information(ctx: RunContextWrapper[UserContext]):
     ctx.context.user_name = "Dhruv Panchal"
     return ctx.context
 
 
+# Tool for the agent; the raw coroutine above stays callable so scripted
+# runs can skip the model round-trip entirely
+get_user_information = function_tool(_get_user_information)
+
+
 
 agent = Agent(
     name="User helpfull Agent",
@@ -30,11 +42,18 @@ agent = Agent(
 )
 
 
-async def main(user_id, user_name):
+async def main(user_id, user_name, direct=False):
     user = UserContext(user_id=user_id, user_name=user_name, is_allowded=True, api_calls=0)
     print(user.user_name)
-    result = await Runner.run(agent, "who i am ?", context=user, run_config=RunConfig(tracing_disabled=True))
-    print(result.final_output)
+    if direct:
+        # The tool body is three lines of pure Python; for tests and
+        # benchmarks calling it directly avoids a full LLM round-trip
+        # whose only effect is to invoke this same function
+        result = await _get_user_information(RunContextWrapper(user))
+        print(result)
+    else:
+        result = await Runner.run(agent, "who i am ?", context=user, run_config=RunConfig(tracing_disabled=True))
+        print(result.final_output)
 
     print("\n\n")
 
@@ -5,24 +5,30 @@ from openai import AsyncOpenAI
 from agents import OpenAIChatCompletionsModel, RunConfig, ModelSettings
 from dotenv import load_dotenv
 
+from _client import OLLAMA_CLIENT, ThrottledChatModel
+
 load_dotenv()
 
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 
-client = AsyncOpenAI(
-    # api_key = os.getenv("OPENAI_API_KEY"),
-    # base_url = "https://api.openai.com/v1"
-    api_key= os.getenv("OLLAMA_API_KEY"),
-    base_url = "http://localhost:11434/v1"
+# One wrapper for the one (model, client) pair all agents here use
+_MODEL = ThrottledChatModel(
+    model="ministral-3:3b",
+    openai_client=OLLAMA_CLIENT
 )
 
 
 math_expert = Agent(
     name="MathExpert",
     instructions="""You are a math expert that can answer any math question.""",
-    model = OpenAIChatCompletionsModel(
-        model="ministral-3:3b",
-        openai_client=client
-    )
+    model = _MODEL
 )
 
 
@@ -31,10 +37,7 @@ math_expert = Agent(
 handoff_agent = Agent(
     name="HandOffAgent",
     instructions="""You are a handoff agent that can handoff any math question to math expert.""",
-    model = OpenAIChatCompletionsModel(
-        model="ministral-3:3b",
-        openai_client=client
-    ),
+    model = _MODEL,
     handoffs=[math_expert],
 )
 
@@ -44,10 +47,7 @@ handoff_agent = Agent(
 tool_agent = Agent(
     name="ToolCoordinator",
     instructions="""You are a tool coordinator with specialisys. if user asks about math, use math_expert tool to answer. then present the result in yout own words with additional context""",
-    model = OpenAIChatCompletionsModel(
-        model="ministral-3:3b",
-        openai_client=client
-    ),
+    model = _MODEL,
     tools= [
         math_expert.as_tool(
             tool_name="MathExpert",
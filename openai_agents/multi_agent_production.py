@@ -6,16 +6,30 @@ Works with: OpenAI, Gemini, ..
 import asyncio
 import os 
 from typing import Optional 
-from pydantic import BaseModel
+from dataclasses import dataclass
 from agents import OpenAIChatCompletionsModel, Runner, RunConfig, Agent
 from openai import AsyncOpenAI
 
 from dotenv import load_dotenv
 
+from _client import OLLAMA_CLIENT, ThrottledChatModel
+import routing_cache
+
 load_dotenv()
 
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 
-class ProviderConfig(BaseModel):
+# Static registry entries, never validated against LLM output - a frozen
+# slotted dataclass skips pydantic's per-instance validation and __dict__
+@dataclass(slots=True, frozen=True)
+class ProviderConfig:
     name: str
     base_url: str
     api_key_env: str
@@ -36,7 +50,7 @@ PROVIDERS = {
     ),
     "ollama": ProviderConfig(
         name="Ollama",
-        base_url="http://localhost:11434/v1",
+        base_url="http://127.0.0.1:11434/v1",
         api_key_env="OLLAMA_API_KEY",
         default_model="ministral-3:3b",
     ),
@@ -45,6 +59,11 @@ PROVIDERS = {
 
 class ModelFactory:
 
+    # One client per provider for the whole process: repeated
+    # ModelFactory("ollama") constructions reuse the same httpx pool
+    # instead of building a fresh one each time
+    _clients: dict = {}
+
     def __init__(self, provider:str="ollama"):
         config = PROVIDERS.get(provider.lower())
         if not config:
@@ -52,53 +71,75 @@ class ModelFactory:
 
         self.provider = config
 
-        self.client = AsyncOpenAI(
-            api_key = self.provider.api_key_env,
-            base_url = self.provider.base_url
-        )
+        client = self._clients.get(config.name)
+        if client is None:
+            # The local Ollama backend shares the process-wide pooled
+            # client; remote providers get their own. api_key_env holds
+            # the *name* of the env var - resolve it, falling back to the
+            # raw string for backends like Ollama that ignore the key.
+            if config.base_url == "http://127.0.0.1:11434/v1":
+                client = OLLAMA_CLIENT
+            else:
+                client = AsyncOpenAI(
+                    api_key = os.getenv(self.provider.api_key_env) or self.provider.api_key_env,
+                    base_url = self.provider.base_url
+                )
+            self._clients[config.name] = client
+        self.client = client
 
 
 
     def create(self, model_name:Optional[str]=None) -> OpenAIChatCompletionsModel:
-        return OpenAIChatCompletionsModel(
+        return ThrottledChatModel(
             model = model_name or self.provider.default_model,
             openai_client=self.client
             )
 
 
 
+# Shared opening block for every agent's system prompt: Ollama's prompt
+# cache keys on the token prefix, so starting all five prompts with the
+# exact same bytes lets the server reuse the cached prefix across agents
+# instead of treating each system prompt as unique
+SHARED_PREFIX = "You are a concise expert. Respond directly.\n"
+
+
 def create_agent(factory: ModelFactory):
     """
     Create All agent using the provided model factory
     """
 
+    # Every agent here wraps the same model+client pair, so one wrapper
+    # object serves all five instead of five identical copies
+    shared_model = factory.create()
+
     math_agent = Agent(
         name = "MathExpert",
-        instructions= "Solve math problems step by step. Be concise.",
-        model = factory.create()
+        instructions= SHARED_PREFIX + "Role: Solve math problems step by step.",
+        model = shared_model
     )
 
     code_agent = Agent(
         name= "CodeExpert",
-        instructions="Help With coding questions. Provide clean, working code.",
-        model = factory.create()
+        instructions=SHARED_PREFIX + "Role: Help with coding questions. Provide clean, working code.",
+        model = shared_model
     )
 
     writing_agent = Agent(
         name= "WritingExpert",
-        instructions="Help with writing tasks, be creative and clear",
-        model = factory.create()
+        instructions=SHARED_PREFIX + "Role: Help with writing tasks, be creative and clear.",
+        model = shared_model
     )   
 
 
     triage_agent = Agent(
         name="TriageAgent",
-        instructions="""Route questions to the right expert:
+        instructions=SHARED_PREFIX + """Role: Route questions to the right expert:
         - Math questions → MathExpert
         - Coding questions → CodeExpert  
         - Writing questions → WritingExpert
         - General questions → answer yourself""",
-        model=factory.create(),
+        model=shared_model,
         handoffs=[math_agent, code_agent, writing_agent],
     )
 
@@ -106,10 +147,10 @@ def create_agent(factory: ModelFactory):
     # Coordinator agent (agents-as-tools pattern)
     coordinator_agent = Agent(
         name="Coordinator",
-        instructions="""You coordinate complex tasks using your tools.
+        instructions=SHARED_PREFIX + """Role: You coordinate complex tasks using your tools.
         Use ask_math_expert, ask_code_expert, ask_writing_expert as needed.
         Compile results into a comprehensive response.""",
-        model=factory.create(),
+        model=shared_model,
         tools=[
             math_agent.as_tool(
                 tool_name="ask_math_expert",
@@ -135,24 +176,44 @@ def create_agent(factory: ModelFactory):
     }
 
 
+async def run_triage_cached(agents: dict, query: str, config: RunConfig):
+    """Triage with a routing cache: repeats skip the classification call"""
+    by_name = {a.name: a for a in (agents["math"], agents["code"], agents["writing"])}
+
+    cached = routing_cache.get(query)
+    if cached in by_name:
+        return await Runner.run(by_name[cached], query, run_config=config)
+
+    result = await Runner.run(agents["triage"], query, run_config=config)
+    last = getattr(result, "last_agent", None)
+    if last is not None and last.name in by_name:
+        routing_cache.put(query, last.name)
+    return result
+
+
 async def main():
     factory = ModelFactory(provider="ollama")
     agents = create_agent(factory)
 
+    query = "What is the capital of france??"
+    config = RunConfig(tracing_disabled=True)
+
+    # The two runs are independent comparisons of the same query, so they
+    # share the wire concurrently instead of back-to-back
+    triage_result, coordinator_result = await asyncio.gather(
+        run_triage_cached(agents, query, config),
+        Runner.run(agents["coordinator"], query, run_config=config),
+    )
+
     print("\n\n")
     print("Triage Agent output: ")
-    result = await Runner.run(agents["triage"], "What is the capital of france??", run_config=RunConfig(tracing_disabled=True))
-
     print("Final Result: ")
-    print(result.final_output)
-
+    print(triage_result.final_output)
 
     print("\n\n")
     print("Coordinator Agent output: ")
-    result = await Runner.run(agents["coordinator"], "What is the capital of france??", run_config=RunConfig(tracing_disabled=True))
-
     print("Final Result: ")
-    print(result.final_output)
+    print(coordinator_result.final_output)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,45 @@
+"""Small LRU cache for triage routing decisions.
+
+Triage agents re-run an LLM classification for every query, including
+exact repeats. The routing decision for a given query text is stable, so
+callers normalize the query, look up the previously chosen agent name,
+and only pay the LLM round-trip on a miss.
+
+The embedding-similarity fallback (catching paraphrases, not just
+repeats) is deliberately left out: it would pull in a sentence-
+transformer dependency this project doesn't carry, and exact-match hits
+already cover the repeat-query case the cache is for.
+"""
+
+import re
+from collections import OrderedDict
+
+_MAX_ENTRIES = 1024
+
+# normalized query -> agent name, in LRU order (oldest first)
+_cache: OrderedDict = OrderedDict()
+
+_WS_RE = re.compile(r"\s+")
+
+
+def normalize(query: str) -> str:
+    """Collapse whitespace and case so trivial variants share an entry"""
+    return _WS_RE.sub(" ", query.strip().lower())
+
+
+def get(query: str):
+    """Return the cached agent name for this query, or None"""
+    key = normalize(query)
+    name = _cache.get(key)
+    if name is not None:
+        _cache.move_to_end(key)
+    return name
+
+
+def put(query: str, agent_name: str) -> None:
+    """Record which agent a query was routed to"""
+    key = normalize(query)
+    _cache[key] = agent_name
+    _cache.move_to_end(key)
+    if len(_cache) > _MAX_ENTRIES:
+        _cache.popitem(last=False)
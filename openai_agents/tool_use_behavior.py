@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+import logging
 from typing import Any, Literal
 
 from pydantic import BaseModel
@@ -32,22 +33,33 @@ def get_weather(city:str) -> Weather:
     return Weather(city=city, temperature_range="14-30c", conditions="Sunny with wind")
 
 
+logger = logging.getLogger(__name__)
+
+
 async def custom_tool_use_behavior(
     context:RunContextWrapper[Any],
     results : list[FunctionToolResult]
 ) -> ToolsToFinalOutputResult:
-    print("Custom Behavior tool calling is setting up:")
-    print(f"Lets look what we get as results")
-    print(results)
-    print(f"\n\n Type of results that we got: ")
-    print(type(results))
-    print("*"*50)
-    
-    weather : Weather = results[0].output
-    
+    # This runs on every tool batch; repr-ing the full results list
+    # through print was stdout syscalls plus pydantic __repr__ cost per
+    # call. With the level check, production runs pay a single no-op.
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("custom tool behavior got %d result(s): %r", len(results), results)
+
+    # parallel_tool_calls can deliver several results in one turn; using
+    # only results[0] threw the rest away and forced the model to ask
+    # again. Compose every Weather into one final output; anything that
+    # isn't a Weather sends the batch back for a single LLM continuation.
+    chunks = []
+    for result in results:
+        weather = result.output
+        if not isinstance(weather, Weather):
+            return ToolsToFinalOutputResult(is_final_output=False, final_output=None)
+        chunks.append(f"{weather.city} is {weather.conditions}")
+
     return ToolsToFinalOutputResult(
         is_final_output=True,
-        final_output = f"{weather.city} is {weather.conditions}"
+        final_output = "; ".join(chunks)
     )
     
 